@@ -0,0 +1,394 @@
+"""
+Banc de mesure des générateurs de rapports.
+
+Génère des JSON synthétiques réalistes (Trivy, Snyk, Dependency-Check) de
+1k à 1M findings, puis mesure pour chaque taille : temps de chargement et de
+rendu (mur + CPU), taille du HTML produit, pic RSS et pic ``tracemalloc``
+par phase. Les résultats sont écrits en JSON ; avec ``--baseline``, le script
+échoue (code 1) si une mesure dépasse la référence de plus de ``--threshold``.
+
+Exemples :
+    python3 scripts/bench_reports.py --sizes 1000,10000
+    python3 scripts/bench_reports.py --save-baseline reports/bench/baseline.json
+    python3 scripts/bench_reports.py --baseline reports/bench/baseline.json --threshold 0.2
+
+Chaque mesure tourne dans un processus neuf (pics RSS indépendants) ; les
+temps et la mémoire Python sont mesurés dans deux processus distincts, car
+``tracemalloc`` ralentit fortement l'exécution.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from reportlib import load_generator
+
+# À incrémenter si le contenu des JSON synthétiques change (données régénérées)
+DATA_VERSION = 1
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+
+# nom -> (fonction de chargement, fonction de rendu) dans le module du générateur
+TOOLS = {
+    "trivy": ("load_trivy_findings", "render_html"),
+    "snyk": ("load_snyk_findings", "render_html_dashboard"),
+    "dependency-check": ("load_dc_findings", "render_html"),
+}
+
+# Mesures comparées à la référence, avec un plancher absolu sous lequel un
+# écart est considéré comme du bruit
+COMPARED = {
+    "load_s": 0.05,
+    "render_s": 0.05,
+    "html_bytes": 4096,
+    "rss_peak_render_kb": 4096,
+    "load_py_peak_kb": 1024,
+    "render_py_peak_kb": 1024,
+}
+
+_SEVERITY_WEIGHTS = (("CRITICAL", 8), ("HIGH", 27), ("MEDIUM", 40), ("LOW", 22), ("UNKNOWN", 3))
+_SEVERITIES = [s for s, w in _SEVERITY_WEIGHTS for _ in range(w)]
+_KNOWN_SEVERITIES = [s for s in _SEVERITIES if s != "UNKNOWN"]
+
+_WORDS = (
+    "buffer overflow allows remote attackers to execute arbitrary code via crafted input "
+    "in the parser when handling malformed headers leading to denial of service memory "
+    "corruption information disclosure improper validation of certificate chains"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _cve(i: int) -> str:
+    return f"CVE-{2015 + i % 10}-{10000 + i}"
+
+
+def _cwes(rng: random.Random) -> list:
+    return [f"CWE-{rng.choice((20, 79, 89, 119, 200, 287, 352, 400, 416, 502, 787))}" for _ in range(rng.randint(0, 2))]
+
+
+def _write_items(fp, items):
+    sep = ""
+    for item in items:
+        fp.write(sep)
+        fp.write(json.dumps(item, ensure_ascii=False))
+        sep = ","
+
+
+# --- Données synthétiques ---------------------------------------------------
+
+
+def _trivy_vuln(rng: random.Random, i: int, n_pkgs: int) -> dict:
+    pkg = rng.randrange(n_pkgs)
+    vuln = {
+        "VulnerabilityID": _cve(i),
+        "PkgID": f"lib{pkg}@1.{pkg % 7}.{pkg % 3}",
+        "PkgName": f"lib{pkg}",
+        "InstalledVersion": f"1.{pkg % 7}.{pkg % 3}",
+        "Severity": rng.choice(_SEVERITIES),
+        "SeveritySource": "nvd",
+        "PrimaryURL": f"https://avd.aquasec.com/nvd/{_cve(i).lower()}",
+        "DataSource": {"ID": "debian", "Name": "Debian Security Tracker", "URL": "https://salsa.debian.org/security-tracker-team/security-tracker"},
+        "Title": _sentence(rng, rng.randint(5, 12)),
+        "Description": " ".join(_sentence(rng, rng.randint(10, 25)) for _ in range(rng.randint(1, 6))),
+        "CweIDs": _cwes(rng),
+        "CVSS": {
+            "nvd": {
+                "V3Vector": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+                "V3Score": round(rng.uniform(2.0, 10.0), 1),
+            }
+        },
+        "References": [f"https://security-tracker.debian.org/tracker/{_cve(i)}?r={k}" for k in range(rng.randint(2, 8))],
+        "PublishedDate": "2023-05-02T18:15:00Z",
+        "LastModifiedDate": "2023-11-07T04:09:00Z",
+    }
+    if rng.random() < 0.6:
+        vuln["FixedVersion"] = f"1.{pkg % 7}.{pkg % 3 + 1}"
+    return vuln
+
+
+def write_trivy(path: Path, n: int, rng: random.Random):
+    n_pkgs = max(10, min(n // 4, 5000))
+    targets = [
+        ("bench/app:latest (debian 12.4)", "os-pkgs", "debian"),
+        ("app/app.jar", "lang-pkgs", "jar"),
+        ("usr/lib/node_modules/npm/package-lock.json", "lang-pkgs", "npm"),
+        ("opt/venv/requirements.txt", "lang-pkgs", "pip"),
+    ]
+    shares = (0.7, 0.15, 0.1, 0.05)
+    with path.open("w", encoding="utf-8") as fp:
+        fp.write('{"SchemaVersion":2,"ArtifactName":"bench/app:latest","ArtifactType":"container_image","Results":[')
+        start = 0
+        for k, ((target, cls, typ), share) in enumerate(zip(targets, shares)):
+            count = n - start if k == len(targets) - 1 else int(n * share)
+            fp.write("," if k else "")
+            fp.write(json.dumps({"Target": target, "Class": cls, "Type": typ})[:-1] + ',"Vulnerabilities":[')
+            _write_items(fp, (_trivy_vuln(rng, i, n_pkgs) for i in range(start, start + count)))
+            fp.write("]}")
+            start += count
+        fp.write("]}")
+
+
+def _snyk_vuln(rng: random.Random, i: int, n_pkgs: int) -> dict:
+    pkg = rng.randrange(n_pkgs)
+    name, version = f"lib{pkg}", f"2.{pkg % 5}.{pkg % 4}"
+    chain = ["bench-app@1.0.0"] + [f"dep{rng.randrange(200)}@{rng.randint(1, 9)}.0.0" for _ in range(rng.randint(0, 4))]
+    fixed = [f"2.{pkg % 5}.{pkg % 4 + 1}"] if rng.random() < 0.6 else []
+    return {
+        "id": f"SNYK-DEBIAN12-LIB{pkg}-{1000000 + i}",
+        "title": _sentence(rng, rng.randint(3, 8)),
+        "severity": rng.choice(_KNOWN_SEVERITIES).lower(),
+        "packageName": name,
+        "version": version,
+        "from": chain + [f"{name}@{version}"],
+        "upgradePath": [],
+        "isUpgradable": False,
+        "isPatchable": False,
+        "identifiers": {"CVE": [_cve(i)], "CWE": _cwes(rng)},
+        "cvssScore": round(rng.uniform(2.0, 10.0), 1),
+        "CVSSv3": "CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:U/C:H/I:N/A:N",
+        "fixedIn": fixed,
+        "description": "## Overview\n" + " ".join(_sentence(rng, rng.randint(10, 25)) for _ in range(rng.randint(2, 8))),
+        "references": [{"title": "NVD", "url": f"https://nvd.nist.gov/vuln/detail/{_cve(i)}"}],
+        "semver": {"vulnerable": [f"<{fixed[0]}" if fixed else "*"]},
+    }
+
+
+def write_snyk(path: Path, n: int, rng: random.Random):
+    n_pkgs = max(10, min(n // 4, 5000))
+    with path.open("w", encoding="utf-8") as fp:
+        fp.write('{"ok":false,"packageManager":"deb","projectName":"bench/app","vulnerabilities":[')
+        _write_items(fp, (_snyk_vuln(rng, i, n_pkgs) for i in range(n)))
+        fp.write(f'],"dependencyCount":{n_pkgs},"uniqueCount":{n}}}')
+
+
+def _dc_vuln(rng: random.Random, i: int) -> dict:
+    score = round(rng.uniform(2.0, 10.0), 1)
+    return {
+        "source": "NVD",
+        "name": _cve(i),
+        "severity": rng.choice(_KNOWN_SEVERITIES),
+        "cvssv2": {"score": round(score * 0.9, 1), "accessVector": "NETWORK", "severity": "HIGH"},
+        "cvssv3": {"baseScore": score, "attackVector": "NETWORK", "baseSeverity": "HIGH"},
+        "cwes": _cwes(rng),
+        "description": " ".join(_sentence(rng, rng.randint(10, 25)) for _ in range(rng.randint(1, 5))),
+        "notes": "",
+        "references": [{"source": "MISC", "url": f"https://example.org/advisory/{i}/{k}", "name": f"ref {k}"} for k in range(rng.randint(2, 10))],
+        "vulnerableSoftware": [{"software": {"id": f"cpe:2.3:a:vendor:lib{i % 500}:{k}.0:*:*:*:*:*:*:*"}} for k in range(rng.randint(1, 12))],
+    }
+
+
+def _dc_dependency(rng: random.Random, d: int, vulns: list) -> dict:
+    dep = {
+        "isVirtual": False,
+        "fileName": f"lib{d}-{d % 9}.{d % 5}.jar",
+        "filePath": f"/workspace/target/lib/lib{d}-{d % 9}.{d % 5}.jar",
+        "md5": f"{d:032x}",
+        "sha1": f"{d:040x}",
+        "evidenceCollected": {
+            "vendorEvidence": [{"type": "vendor", "confidence": "HIGH", "source": "pom", "name": "groupid", "value": f"org.lib{d}"}] * rng.randint(3, 10),
+            "productEvidence": [{"type": "product", "confidence": "HIGH", "source": "pom", "name": "artifactid", "value": f"lib{d}"}] * rng.randint(3, 10),
+            "versionEvidence": [{"type": "version", "confidence": "HIGH", "source": "pom", "name": "version", "value": f"{d % 9}.{d % 5}"}] * rng.randint(2, 6),
+        },
+        "packages": [{"id": f"pkg:maven/org.lib{d}/lib{d}@{d % 9}.{d % 5}", "confidence": "HIGH"}],
+    }
+    if vulns:
+        dep["vulnerabilities"] = vulns
+    return dep
+
+
+def write_dependency_check(path: Path, n: int, rng: random.Random):
+    def dependencies():
+        i = d = 0
+        while i < n:
+            count = min(n - i, rng.randint(1, 9))
+            yield _dc_dependency(rng, d, [_dc_vuln(rng, k) for k in range(i, i + count)])
+            i += count
+            d += 1
+            if rng.random() < 0.3:  # dépendances sans vulnérabilité
+                yield _dc_dependency(rng, d, [])
+                d += 1
+
+    with path.open("w", encoding="utf-8") as fp:
+        fp.write('{"reportSchema":"1.1","scanInfo":{"engineVersion":"9.0.9"},"projectInfo":{"name":"bench-app"},"dependencies":[')
+        _write_items(fp, dependencies())
+        fp.write("]}")
+
+
+WRITERS = {
+    "trivy": write_trivy,
+    "snyk": write_snyk,
+    "dependency-check": write_dependency_check,
+}
+
+
+def dataset(workdir: Path, tool: str, n: int) -> Path:
+    """JSON synthétique ``tool`` / ``n`` findings, généré une fois puis réutilisé."""
+    path = workdir / f"{tool}-{n}-v{DATA_VERSION}.json"
+    if not path.exists():
+        tmp = path.with_suffix(".tmp")
+        WRITERS[tool](tmp, n, random.Random(n))
+        tmp.replace(path)
+    return path
+
+
+# --- Mesure (processus enfant) ----------------------------------------------
+
+
+def _rss_peak_kb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(tool: str, json_path: Path, html_path: Path, memory: bool) -> dict:
+    """Charge puis rend ``json_path`` ; temps + RSS, ou pics ``tracemalloc`` si ``memory``."""
+    module = load_generator(tool)
+    load_name, render_name = TOOLS[tool]
+    load, render = getattr(module, load_name), getattr(module, render_name)
+
+    if memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    findings = load(json_path) or []
+    result = {
+        "findings": len(findings),
+        "load_s": time.perf_counter() - wall,
+        "load_cpu_s": time.process_time() - cpu,
+    }
+    if memory:
+        result["load_py_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.reset_peak()
+    else:
+        result["rss_peak_load_kb"] = _rss_peak_kb()
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    with html_path.open("w", encoding="utf-8") as fp:
+        render(findings, fp)
+    result["render_s"] = time.perf_counter() - wall
+    result["render_cpu_s"] = time.process_time() - cpu
+    result["html_bytes"] = html_path.stat().st_size
+    if memory:
+        result["render_py_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+        return {k: result[k] for k in ("load_py_peak_kb", "render_py_peak_kb")}
+    result["rss_peak_render_kb"] = _rss_peak_kb()
+    return result
+
+
+def _child(tool: str, json_path: Path, html_path: Path, memory: bool) -> dict:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", tool, str(json_path), str(html_path)]
+    if memory:
+        cmd.append("--memory")
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    # Les générateurs affichent aussi leurs messages : le résultat est la dernière ligne
+    return json.loads(out.strip().splitlines()[-1])
+
+
+# --- Référence ----------------------------------------------------------------
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Liste des régressions ``(outil, taille, mesure, référence, valeur)``."""
+    reference = {(r["tool"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        ref = reference.get((r["tool"], r["size"]))
+        if ref is None:
+            continue
+        for metric, floor in COMPARED.items():
+            old, new = ref.get(metric), r.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append((r["tool"], r["size"], metric, old, new))
+    return regressions
+
+
+def _print_results(results: list):
+    print(f"{'outil':<17}{'taille':>9}{'load s':>9}{'render s':>10}{'HTML Mo':>9}{'RSS Mo':>8}{'py load Mo':>11}{'py rendu Mo':>12}")
+    for r in results:
+        rss = r.get("rss_peak_render_kb")
+        print(
+            f"{r['tool']:<17}{r['size']:>9}{r['load_s']:>9.2f}{r['render_s']:>10.2f}"
+            f"{r['html_bytes'] / 1e6:>9.1f}{(rss or 0) / 1024:>8.0f}"
+            f"{r['load_py_peak_kb'] / 1024:>11.1f}{r['render_py_peak_kb'] / 1024:>12.1f}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mesure les performances des générateurs de rapports.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Tailles (findings), séparées par des virgules (défaut : {DEFAULT_SIZES}).")
+    parser.add_argument("--tools", default=",".join(TOOLS), help="Générateurs mesurés (défaut : tous).")
+    parser.add_argument("--workdir", type=Path, default=Path("target/bench-data"), help="JSON synthétiques et HTML produits.")
+    parser.add_argument("--output", type=Path, default=Path("reports/bench/bench-results.json"), help="Résultats JSON.")
+    parser.add_argument("--baseline", type=Path, help="Résultats de référence : échec si une mesure régresse.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Régression tolérée par rapport à la référence (0.25 = +25 %%).")
+    parser.add_argument("--save-baseline", type=Path, help="Écrit aussi les résultats comme nouvelle référence.")
+    parser.add_argument("--child", nargs=3, metavar=("TOOL", "JSON", "HTML"), help=argparse.SUPPRESS)
+    parser.add_argument("--memory", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.child:
+        tool, json_path, html_path = args.child
+        print(json.dumps(measure(tool, Path(json_path), Path(html_path), args.memory)))
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    tools = [t for t in args.tools.split(",") if t]
+    args.workdir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for tool in tools:
+        for size in sizes:
+            start = time.perf_counter()
+            json_path = dataset(args.workdir, tool, size)
+            html_path = args.workdir / f"{tool}-{size}.html"
+            result = {"tool": tool, "size": size, "json_bytes": json_path.stat().st_size}
+            result.update(_child(tool, json_path, html_path, memory=False))
+            result.update(_child(tool, json_path, html_path, memory=True))
+            results.append(result)
+            print(f"⏱️  {tool} {size} : {time.perf_counter() - start:.1f} s")
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "data_version": DATA_VERSION,
+        "results": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print()
+    _print_results(results)
+    print(f"\n✅ Résultats écrits : {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        for tool, size, metric, old, new in regressions:
+            print(f"❌ Régression {tool} {size} {metric} : {old} -> {new} (+{(new / old - 1) * 100:.0f} %)")
+        if regressions:
+            return 1
+        print(f"✅ Aucune régression au-delà de {args.threshold:.0%} par rapport à {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
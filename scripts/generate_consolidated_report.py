@@ -0,0 +1,205 @@
+from html import escape
+from pathlib import Path
+
+from generate_dependencycheck_report import load_dc_findings
+from generate_snyk_report import load_snyk_findings
+from generate_trivy_report import load_trivy_findings
+from reportlib.assets import base_stylesheet_link, publish_base_stylesheet, stylesheet
+from reportlib.cli import build_output_parser
+from reportlib.compress import open_output, write_text
+from reportlib.html_writer import ChunkedWriter
+from reportlib.metrics import Metrics
+from reportlib.model import SEVERITIES
+
+# (clé, libellé affiché) dans l'ordre des colonnes
+SCANNERS = [
+    ("trivy", "Trivy"),
+    ("snyk", "Snyk"),
+    ("dependency-check", "Dependency-Check"),
+]
+
+
+class Issue:
+    """Une CVE / advisory et ce qu'en disent les différents scanners."""
+
+    __slots__ = ("key", "severity", "title", "packages", "tools")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.severity = ""
+        self.title = ""
+        self.packages = {}
+        self.tools = {}
+
+
+def _rank(severity: str) -> int:
+    return SEVERITIES.index(severity) if severity in SEVERITIES else len(SEVERITIES)
+
+
+def join_by_cve(*sources) -> list:
+    """
+    Jointure par hachage des findings de plusieurs scanners sur leur CVE
+    (ou, à défaut, leur identifiant d'advisory). Chaque finding est visité une
+    seule fois ; les issues sortent triées par sévérité puis par clé.
+    """
+    issues = {}
+    for findings in sources:
+        for f in findings:
+            for key in f.cves or (f.vuln_id,):
+                if not key:
+                    continue
+                issue = issues.get(key)
+                if issue is None:
+                    issue = issues[key] = Issue(key)
+                issue.tools[f.tool] = issue.tools.get(f.tool, 0) + 1
+                if f.pkg:
+                    issue.packages[f"{f.pkg}@{f.version}" if f.version else f.pkg] = None
+                if not issue.severity or _rank(f.severity) < _rank(issue.severity):
+                    issue.severity = f.severity
+                if not issue.title:
+                    issue.title = f.title
+
+    return sorted(issues.values(), key=lambda i: (_rank(i.severity), i.key))
+
+
+def render_html(issues: list, out):
+    """
+    Génère le rapport consolidé (une ligne par CVE, une colonne par scanner),
+    écrit au fil de l'eau dans ``out``.
+    """
+    counts = {s: 0 for s in SEVERITIES}
+    by_tools = {n: 0 for n in range(1, len(SCANNERS) + 1)}
+    for issue in issues:
+        if issue.severity in counts:
+            counts[issue.severity] += 1
+        by_tools[len(issue.tools)] = by_tools.get(len(issue.tools), 0) + 1
+
+    w = ChunkedWriter(out)
+    w.write(_html_header(len(issues), counts, by_tools))
+
+    for issue in issues:
+        sev = issue.severity or "UNKNOWN"
+        cells = []
+        for tool, _ in SCANNERS:
+            hits = issue.tools.get(tool)
+            if hits:
+                cells.append(f"<td class='tool tool-hit'>✔{f' ×{hits}' if hits > 1 else ''}</td>")
+            else:
+                cells.append("<td class='tool tool-miss'>—</td>")
+        title = f"<p class='v-desc'>{escape(issue.title)}</p>" if issue.title else ""
+        packages = ", ".join(issue.packages)
+        if packages:
+            packages = f"<p class='v-pkg'>{escape(packages)}</p>"
+        w.write(
+            f"<tr>"
+            f"<td><span class='sev sev-{escape(sev.lower())}'>{escape(sev)}</span></td>"
+            f"<td class='col-main'>"
+            f"<div class='v-title'>{escape(issue.key)}</div>"
+            f"{title}"
+            f"{packages}"
+            f"</td>"
+            f"{''.join(cells)}"
+            f"</tr>"
+        )
+
+    if not issues:
+        w.write(f"<tr><td colspan='{2 + len(SCANNERS)}' class='no-data'>Aucune vulnérabilité détectée.</td></tr>")
+
+    w.write(HTML_FOOTER)
+    w.flush()
+
+
+def _html_header(total: int, counts: dict, by_tools: dict) -> str:
+    tool_headers = "".join(f"<th class='tool'>{label}</th>" for _, label in SCANNERS)
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+  <head>
+    <meta charset="UTF-8" />
+    <title>Rapport consolidé</title>
+    {base_stylesheet_link()}
+    <link rel="stylesheet" href="consolidated-report.css" />
+  </head>
+  <body>
+    <main class="page">
+      <section class="header">
+        <p class="eyebrow">Trivy · Snyk · Dependency-Check</p>
+        <h1>Rapport consolidé</h1>
+        <p class="subtitle">Vulnérabilités regroupées par CVE, avec les scanners qui les signalent.</p>
+        <div class="summary-row">
+          <span class="summary-pill">Total : <strong>{total}</strong></span>
+          <span class="summary-pill">Vues par 1 scanner : <strong>{by_tools.get(1, 0)}</strong></span>
+          <span class="summary-pill">Par 2 : <strong>{by_tools.get(2, 0)}</strong></span>
+          <span class="summary-pill">Par 3 : <strong>{by_tools.get(3, 0)}</strong></span>
+        </div>
+        <div class="summary-grid">
+          <div class="summary-card">
+            <div class="summary-label">Critiques</div>
+            <div class="summary-value crit">{counts["CRITICAL"]}</div>
+          </div>
+          <div class="summary-card">
+            <div class="summary-label">Hautes</div>
+            <div class="summary-value high">{counts["HIGH"]}</div>
+          </div>
+          <div class="summary-card">
+            <div class="summary-label">Moyennes</div>
+            <div class="summary-value med">{counts["MEDIUM"]}</div>
+          </div>
+          <div class="summary-card">
+            <div class="summary-label">Basses</div>
+            <div class="summary-value low">{counts["LOW"]}</div>
+          </div>
+        </div>
+        <table>
+          <thead>
+            <tr>
+              <th style="width:110px;">Gravité</th>
+              <th>CVE / Advisory</th>
+              {tool_headers}
+            </tr>
+          </thead>
+          <tbody>
+"""
+
+
+HTML_FOOTER = """
+          </tbody>
+        </table>
+      </section>
+    </main>
+  </body>
+</html>"""
+
+
+def main(argv=None):
+    # Pagination, cache, historique... ne concernent pas ce rapport : refusés
+    args = build_output_parser("Génère le rapport HTML consolidé (Trivy, Snyk, Dependency-Check).").parse_args(argv)
+    metrics = Metrics.from_args(args, "consolidated")
+
+    with metrics.phase("load"):
+        trivy = load_trivy_findings(Path("reports/trivy/trivy-report.json"))
+        snyk = load_snyk_findings(Path("reports/snyk/snyk-report.json")) or []
+        dc = load_dc_findings(Path("target/dependency-check-report.json"))
+
+    with metrics.phase("aggregate"):
+        issues = join_by_cve(trivy, snyk, dc)
+
+    out_dir = Path("reports/consolidated")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    out_html = out_dir / "consolidated-report.html"
+    with metrics.phase("render"):
+        with open_output(out_html, args.compress) as fp:
+            render_html(issues, metrics.sink(fp))
+
+    with metrics.phase("write"):
+        # Feuille commune aux rapports, puis les surcharges propres au consolidé
+        publish_base_stylesheet(out_dir.parent, args.compress)
+        write_text(out_dir / "consolidated-report.css", stylesheet("consolidated"), args.compress, css=True)
+
+    print(f"✅ Rapport HTML consolidé généré : {out_html} ({len(issues)} CVE/advisories)")
+    metrics.info["findings"] = len(issues)
+    metrics.write(out_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
+import functools
 import json
 from html import escape
 from pathlib import Path
 
+from reportlib.aggregate import aggregate, breakdown_html
+from reportlib.assets import base_stylesheet_link
+from reportlib.cli import build_parser
+from reportlib.cvss import resolve_score
+from reportlib.details import details_script, details_toggle, short_title
+from reportlib.delta import delta_badge, delta_summary
+from reportlib.json_stream import EACH, iter_items
+from reportlib.model import Finding, as_list, format_score
+from reportlib.pages import PageLayout, write_page, write_sharded
+from reportlib.runner import Renderers, run_report
+
 
 def load_dc_json(path: Path):
     """
@@ -19,215 +31,156 @@ def load_dc_json(path: Path):
         return None
 
 
-DC_DASHBOARD_CSS = """\
-* { box-sizing: border-box; }
-body {
-  margin: 0;
-  min-height: 100vh;
-  padding: 24px 16px 32px;
-  background: #f9fafb;
-  font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-  color: #111827;
-}
-.page {
-  max-width: 1120px;
-  margin: 0 auto;
-}
-.header {
-  border-radius: 24px;
-  background: #ffffff;
-  border: 1px solid #e5e7eb;
-  padding: 22px 24px 18px;
-  box-shadow: 0 22px 50px rgba(148,163,184,0.25);
-}
-.eyebrow {
-  margin: 0 0 4px;
-  font-size: 11px;
-  letter-spacing: 0.16em;
-  text-transform: uppercase;
-  color: #0f766e;
-}
-h1 {
-  margin: 0;
-  font-size: 22px;
-  letter-spacing: 0.03em;
-}
-.subtitle {
-  margin-top: 4px;
-  font-size: 13px;
-  color: #6b7280;
-}
-.summary-grid {
-  margin-top: 16px;
-  display: grid;
-  grid-template-columns: repeat(4, minmax(0,1fr));
-  gap: 10px;
-}
-.summary-card {
-  border-radius: 16px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 10px 12px;
-}
-.summary-label {
-  font-size: 11px;
-  text-transform: uppercase;
-  letter-spacing: 0.15em;
-  color: #9ca3af;
-  margin-bottom: 2px;
-}
-.summary-value {
-  font-size: 18px;
-  font-weight: 700;
-}
-.crit { color: #b91c1c; }
-.high { color: #dc2626; }
-.med { color: #d97706; }
-.low { color: #0369a1; }
-
-table {
-  width: 100%;
-  border-collapse: collapse;
-  margin-top: 18px;
-}
-thead th {
-  font-size: 11px;
-  text-transform: uppercase;
-  letter-spacing: 0.14em;
-  color: #9ca3af;
-  padding: 0 8px 4px;
-  text-align: left;
-  border-bottom: 1px solid #e5e7eb;
-}
-tbody tr + tr td {
-  border-top: 1px solid #f3f4f6;
-}
-td {
-  padding: 8px;
-  vertical-align: top;
-  font-size: 13px;
-}
-.sev {
-  width: 80px;
-  font-size: 11px;
-  font-weight: 600;
-  text-align: center;
-  border-radius: 999px;
-  padding: 4px 10px;
-  display: inline-flex;
-  align-items: center;
-  justify-content: center;
-}
-.sev-CRITICAL { background:#fef2f2; color:#b91c1c; }
-.sev-HIGH     { background:#fef2f2; color:#dc2626; }
-.sev-MEDIUM   { background:#fffbeb; color:#d97706; }
-.sev-LOW      { background:#eff6ff; color:#0369a1; }
-.file-name {
-  margin: 0 0 2px;
-  font-weight: 600;
-}
-.vuln-title {
-  margin: 0 0 2px;
-  font-size: 13px;
-  font-weight: 600;
-}
-.vuln-id {
-  margin: 0;
-  font-size: 12px;
-  color: #6b7280;
-}
-.vuln-id span {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-  color: #111827;
-}
-.chips {
-  margin-top: 6px;
-  display: flex;
-  flex-wrap: wrap;
-  gap: 6px;
-  font-size: 11px;
-}
-.chip {
-  border-radius: 999px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 2px 8px;
-  display: inline-flex;
-  align-items: center;
-  gap: 4px;
-}
-.chip-label {
-  color: #6b7280;
-}
-.chip-value {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-}
-.no-data {
-  text-align: center;
-  font-size: 13px;
-  color: #6b7280;
-  padding: 16px 0;
-}
-@media (max-width: 768px) {
-  .summary-grid { grid-template-columns: repeat(2, minmax(0,1fr)); }
-}
-"""
-
-
-def render_html(data: dict) -> str:
+def to_finding(file_name: str, v: dict, references: bool = False) -> Finding:
     """
-    Génère un rapport HTML dashboard à partir du JSON Dependency-Check.
+    Convertit une entrée ``vulnerabilities[]`` de Dependency-Check en ``Finding``
+    (avec les URL de ``references`` si ``references``).
     """
+    cvssv3 = v.get("cvssv3") if isinstance(v.get("cvssv3"), dict) else {}
+    cvssv2 = v.get("cvssv2") if isinstance(v.get("cvssv2"), dict) else {}
+    vuln_id = v.get("name") or v.get("id") or ""
+    cvss_vector = cvssv3.get("vectorString") or cvssv2.get("vectorString") or ""
+    return Finding(
+        tool="dependency-check",
+        severity=v.get("severity"),
+        vuln_id=vuln_id,
+        description=v.get("description"),
+        pkg=file_name,
+        cvss_score=resolve_score(v.get("cvssScore") or cvssv3.get("baseScore") or cvssv2.get("score"), cvss_vector),
+        cvss_vector=cvss_vector,
+        cwes=as_list(v.get("cwes") or v.get("cwe")),
+        cves=[vuln_id] if vuln_id.startswith("CVE-") else [],
+        target=file_name,
+        references=[r.get("url") or r.get("name") for r in v.get("references") or [] if isinstance(r, dict)]
+        if references
+        else (),
+    )
+
+
+def extract_dc_vulns(data: dict, convert=to_finding) -> list:
+    """Aplatit ``dependencies[].vulnerabilities[]`` d'un JSON déjà chargé."""
     deps = data.get("dependencies", []) if data else []
 
     vulns = []
     for dep in deps:
         file_name = dep.get("fileName") or dep.get("name") or ""
         for v in dep.get("vulnerabilities", []) or []:
-            entry = {
-                "severity": v.get("severity", "UNKNOWN"),
-                "id": v.get("name") or v.get("id") or "",
-                "title": v.get("description") or v.get("description", "")[:120],
-                "fileName": file_name,
-                "cwe": (v.get("cwe") or "")[:40],
-                "cvss": v.get("cvssScore") or v.get("cvssv3") or "",
-            }
-            vulns.append(entry)
-
-    severities = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
-    counts = {s: 0 for s in severities}
-    for v in vulns:
-        sev = (v.get("severity") or "").upper()
-        if sev in counts:
-            counts[sev] += 1
-
-    rows = []
-    for v in vulns:
-        sev = (v.get("severity") or "UNKNOWN").upper()
-        rows.append(
-            f"<tr>"
-            f"<td><span class='sev sev-{escape(sev)}'>{escape(sev)}</span></td>"
-            f"<td>"
-            f"<div class='file-name'>{escape(v.get('fileName') or '')}</div>"
-            f"<div class='vuln-title'>{escape(v.get('title') or '')}</div>"
-            f"<p class='vuln-id'>ID : <span>{escape(v.get('id') or '')}</span></p>"
-            f"<div class='chips'>"
-            f"<span class='chip'><span class='chip-label'>CWE</span><span class='chip-value'>{escape(v.get('cwe') or '')}</span></span>"
-            f"<span class='chip'><span class='chip-label'>CVSS</span><span class='chip-value'>{escape(str(v.get('cvss') or ''))}</span></span>"
-            f"</div>"
-            f"</td>"
-            f"</tr>"
-        )
-
-    body_rows = "".join(rows) if rows else (
-        "<tr><td colspan='2' class='no-data'>Aucune vulnérabilité détectée par OWASP Dependency-Check.</td></tr>"
+            vulns.append(convert(file_name, v))
+    return vulns
+
+
+def iter_dc_vulns(path: Path, convert=to_finding):
+    """
+    Parcourt le JSON Dependency-Check en streaming : une vulnérabilité de
+    ``dependencies[].vulnerabilities[]`` à la fois (``Finding``), avec le
+    fichier de la dépendance associée. Lève ``json.JSONDecodeError`` si le JSON
+    est invalide.
+    """
+    prefix = ("dependencies", EACH, "vulnerabilities", EACH)
+    for ctx, v in iter_items(path, prefix, keep=("fileName", "name")):
+        if isinstance(v, dict):
+            yield convert(ctx.get("fileName") or ctx.get("name") or "", v)
+
+
+def load_dc_findings(path: Path, convert=to_finding) -> list:
+    """
+    Vulnérabilités Dependency-Check du rapport, lues en streaming.
+    Liste vide si le fichier est absent ou invalide.
+    """
+    if not path.exists():
+        print(f"❌ Fichier Dependency-Check introuvable: {path}")
+        return []
+
+    try:
+        return list(iter_dc_vulns(path, convert))
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON Dependency-Check invalide: {e}")
+        return []
+
+
+def render_html(vulns: list, out, delta=None, agg=None, details=False):
+    """
+    Génère un rapport HTML dashboard à partir des vulnérabilités Dependency-Check
+    (voir ``iter_dc_vulns`` / ``extract_dc_vulns``), écrit au fil de l'eau dans ``out``.
+    ``agg`` : agrégats déjà calculés (``aggregate(vulns)`` sinon) ; ``details`` :
+    descriptions dans le JSON annexe (voir ``reportlib.details``).
+    """
+    write_page(out, _layout(agg or aggregate(vulns), delta, details), (render_row(v, details) for v in vulns))
+
+
+def render_html_shards(
+    vulns: list, out_dir: Path, rows_per_page: int, delta=None, agg=None, details=False, compress=False, sink=None
+) -> list:
+    """
+    Variante découpée : ``dependency-check-001.html``... de ``rows_per_page``
+    lignes chacune, et ``dependency-check.html`` comme index avec le résumé.
+    """
+    return write_sharded(
+        out_dir,
+        "dependency-check",
+        _layout(agg or aggregate(vulns), delta, details),
+        (render_row(v, details) for v in vulns),
+        len(vulns),
+        rows_per_page,
+        compress,
+        sink,
+    )
+
+
+def render_html_virtual(vulns: list, out, delta=None, agg=None):
+    """
+    Variante "tableau virtualisé" : findings embarqués en JSON compact, seules
+    les lignes visibles sont créées par le navigateur.
+    """
+    from reportlib.virtual import write_virtual_page  # chargé seulement pour ce mode
+
+    write_virtual_page(out, _layout(agg or aggregate(vulns), delta), vulns)
+
+
+def render_row(v: Finding, details: bool = False) -> str:
+    """
+    Une ligne ``<tr>`` du tableau pour une vulnérabilité. Avec ``details``, le
+    titre se limite à la première phrase et la description complète est
+    chargée à la demande.
+    """
+    sev = v.severity or "UNKNOWN"
+    title = short_title(v.description) if details else v.description
+    more = details_toggle(v.vuln_id) if details else ""
+    return (
+        f"<tr>"
+        f"<td><span class='sev sev-{escape(sev)}'>{escape(sev)}</span></td>"
+        f"<td>"
+        f"<div class='file-name'>{delta_badge(v)}{escape(v.target)}</div>"
+        f"<div class='vuln-title'>{escape(title)}</div>"
+        f"<p class='vuln-id'>ID : <span>{escape(v.vuln_id)}</span></p>"
+        f"<div class='chips'>"
+        f"<span class='chip'><span class='chip-label'>CWE</span><span class='chip-value'>{escape(', '.join(v.cwes)[:40])}</span></span>"
+        f"<span class='chip'><span class='chip-label'>CVSS</span><span class='chip-value'>{escape(format_score(v.cvss_score))}</span></span>"
+        f"</div>"
+        f"{more}"
+        f"</td>"
+        f"</tr>"
+    )
+
+
+def _layout(agg, delta=None, details=False) -> PageLayout:
+    # Dependency-Check ne donne pas de version corrigée ; package = fichier analysé
+    return PageLayout(
+        start=_page_start(agg.counts) + breakdown_html(agg, package_label="Fichiers", fixes=False) + delta_summary(delta),
+        table_start=TABLE_START,
+        table_end=TABLE_END,
+        end=(details_script("dependency-check") if details else "") + PAGE_END,
+        empty_row="<tr><td colspan='2' class='no-data'>Aucune vulnérabilité détectée par OWASP Dependency-Check.</td></tr>",
     )
 
+
+def _page_start(counts: dict) -> str:
     return f"""<!DOCTYPE html>
 <html lang="fr">
   <head>
     <meta charset="UTF-8" />
     <title>Rapport OWASP Dependency-Check</title>
+    {base_stylesheet_link()}
     <link rel="stylesheet" href="dependency-check.css" />
   </head>
   <body>
@@ -253,7 +206,10 @@ def render_html(data: dict) -> str:
             <div class="summary-label">Basses</div>
             <div class="summary-value low">{counts["LOW"]}</div>
           </div>
-        </div>
+        </div>"""
+
+
+TABLE_START = """
         <table>
           <thead>
             <tr>
@@ -262,30 +218,39 @@ def render_html(data: dict) -> str:
             </tr>
           </thead>
           <tbody>
-{body_rows}
+"""
+
+TABLE_END = """
           </tbody>
-        </table>
+        </table>"""
+
+PAGE_END = """
       </section>
     </main>
   </body>
 </html>"""
 
 
-def main():
-    json_path = Path("target/dependency-check-report.json")
-    data = load_dc_json(json_path)
-
-    out_dir = Path("reports/dependency-check")
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    # CSS externe
-    (out_dir / "dependency-check.css").write_text(DC_DASHBOARD_CSS, encoding="utf-8")
-
-    html = render_html(data)
-    out_html = out_dir / "dependency-check.html"
-    out_html.write_text(html, encoding="utf-8")
-
-    print(f"✅ Rapport HTML OWASP Dependency-Check généré : {out_html}")
+def main(argv=None):
+    args = build_parser("Génère le rapport HTML OWASP Dependency-Check.").parse_args(argv)
+    # Sans objet en mode virtualisé : le tableau n'affiche pas de description
+    details = args.lazy_details and not args.virtual
+    run_report(
+        args,
+        tool="dependency-check",
+        title="Rapport HTML OWASP Dependency-Check",
+        json_path=Path("target/dependency-check-report.json"),
+        out=Path("reports/dependency-check/dependency-check.html"),
+        generator_file=__file__,
+        load=load_dc_findings,
+        convert=functools.partial(to_finding, references=True) if details else to_finding,
+        renderers=Renderers(
+            page=functools.partial(render_html, details=details),
+            virtual=render_html_virtual,
+            shards=functools.partial(render_html_shards, details=details),
+        ),
+        details=details,
+    )
 
 
 if __name__ == "__main__":
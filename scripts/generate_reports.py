@@ -0,0 +1,88 @@
+"""
+Point d'entrée unique : détecte les JSON de scanners présents, puis lance les
+générateurs correspondants en parallèle (un processus chacun) et affiche le
+statut et la durée de chaque génération.
+
+Les options non reconnues ici (``--rows-per-page``, ``--virtual``,
+``--cache-dir``...) sont transmises telles quelles à chaque générateur ; le
+rapport consolidé ne reçoit que les options de sortie (``--compress``,
+``--metrics``, ``--metrics-log``).
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from reportlib import GENERATORS, load_generator
+from reportlib.cli import build_parser, output_argv
+
+
+def _run(name: str, argv) -> tuple:
+    """Exécuté dans un processus du pool : ``(nom, erreur ou None, durée en s)``."""
+    start = time.perf_counter()
+    try:
+        load_generator(name).main(argv)
+        error = None
+    except SystemExit as exc:
+        error = None if not exc.code else f"sortie {exc.code}"
+    except Exception as exc:  # un générateur en échec ne doit pas bloquer les autres
+        error = f"{type(exc).__name__}: {exc}"
+    return name, error, time.perf_counter() - start
+
+
+def discover(only=None) -> tuple:
+    """``(à lancer, absents)`` d'après les JSON présents dans le workspace."""
+    present, missing = [], []
+    for name, (json_path, _) in GENERATORS.items():
+        if only and name not in only:
+            continue
+        (present if Path(json_path).exists() else missing).append((name, json_path))
+    return present, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère tous les rapports HTML disponibles, en parallèle.")
+    parser.add_argument("--jobs", type=int, default=0, help="Processus en parallèle (défaut : un par générateur, borné aux cœurs).")
+    parser.add_argument("--only", help="Liste de générateurs à lancer, séparés par des virgules (trivy,snyk,dependency-check).")
+    parser.add_argument("--no-consolidated", action="store_true", help="Ne génère pas le rapport consolidé.")
+    args, forwarded = parser.parse_known_args(argv)
+
+    # Valide les options transmises avant de démarrer les processus
+    options = build_parser("Options transmises aux générateurs.").parse_args(forwarded)
+
+    only = set(args.only.split(",")) if args.only else None
+    present, missing = discover(only)
+    for name, json_path in missing:
+        print(f"⏭️  {name} : {json_path} absent, rapport ignoré")
+    if not present:
+        print("❌ Aucun JSON de scanner trouvé, rien à générer.")
+        return 1
+
+    tasks = [(name, forwarded) for name, _ in present]
+    if not args.no_consolidated:
+        # Le consolidé relit lui-même les JSON : il tourne en même temps que les autres
+        # et n'accepte que les options de sortie (--compress, --metrics...)
+        tasks.append(("consolidated", output_argv(options)))
+
+    jobs = args.jobs or min(len(tasks), os.cpu_count() or 1)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_run, *task) for task in tasks]
+        results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+
+    print(f"\n📋 Rapports ({jobs} processus, {elapsed:.2f} s au total)")
+    failed = 0
+    for name, error, duration in results:
+        if error:
+            failed += 1
+            print(f"  ❌ {name:<18} {duration:6.2f} s  {error}")
+        else:
+            print(f"  ✅ {name:<18} {duration:6.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,24 @@
+import functools
 import json
 from pathlib import Path
 from html import escape
 
+from reportlib.aggregate import aggregate, breakdown_html
+from reportlib.assets import base_stylesheet_link, stylesheet
+from reportlib.cli import build_parser
+from reportlib.cvss import resolve_score
+from reportlib.delta import delta_badge, delta_summary
+from reportlib.deptree import build_tree, walk
+from reportlib.json_stream import EACH, iter_items, pick_document, top_level
+from reportlib.model import Finding, as_list, count_by_severity
+from reportlib.pages import PageLayout, write_page, write_sharded
+from reportlib.runner import Renderers, run_report
+
 
 def load_snyk_json(path: Path):
     """
     Charge le JSON Snyk.
-    Gère à la fois un JSON unique et un fichier avec plusieurs lignes JSON (cas CLI).
+    Gère à la fois un JSON unique et un fichier avec plusieurs documents JSON (cas CLI).
     """
     if not path.exists():
         print(f"❌ Fichier Snyk introuvable: {path}")
@@ -16,33 +28,136 @@ def load_snyk_json(path: Path):
     try:
         return json.loads(content)
     except json.JSONDecodeError:
-        # Fallback : essayer ligne par ligne (comme pour Trivy)
-        for line in reversed(content.splitlines()):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                return json.loads(line)
-            except json.JSONDecodeError:
-                continue
+        # Fallback : plusieurs documents JSON (ou du bruit autour), on garde le dernier
+        data = pick_document(content, "last", keys=("vulnerabilities", "ok"), arrays=True)
+        if data is not None:
+            return data
         print("❌ Aucun JSON valide trouvé dans le rapport Snyk.")
         return None
 
 
-def render_html(data: dict) -> str:
+def to_finding(v: dict, project: str = "") -> Finding:
+    """
+    Convertit une entrée ``vulnerabilities[]`` de Snyk en ``Finding``.
+    ``project`` : projet d'origine (sortie ``--all-projects``), gardé comme cible.
+    """
+    identifiers = v.get("identifiers") or {}
+    return Finding(
+        tool="snyk",
+        severity=v.get("severity"),
+        vuln_id=v.get("id"),
+        title=v.get("title") or v.get("name"),
+        description=v.get("description"),
+        pkg=v.get("packageName") or v.get("moduleName"),
+        version=v.get("version"),
+        fixed=", ".join(str(f) for f in as_list(v.get("fixedIn"))),
+        cvss_score=resolve_score(v.get("cvssScore"), v.get("CVSSv3") or ""),
+        cvss_vector=v.get("CVSSv3"),
+        cwes=as_list(identifiers.get("CWE")),
+        cves=as_list(identifiers.get("CVE")),
+        url=v.get("url"),
+        target=project,
+        path=as_list(v.get("from")),
+    )
+
+
+def project_label(project: dict, index: int) -> str:
+    """Nom affiché d'un projet de ``snyk test --all-projects`` (nom et fichier manifeste)."""
+    name = project.get("projectName") or project.get("path") or f"Projet {index + 1}"
+    manifest = project.get("displayTargetFile") or project.get("targetFile")
+    return f"{name} ({manifest})" if manifest else str(name)
+
+
+def _project_vulns(project: dict, convert, label: str = "") -> list:
+    return [convert(v, project=label) for v in project.get("vulnerabilities") or [] if isinstance(v, dict)]
+
+
+def _labelled(project: dict, index: int, projects) -> str:
+    label = project_label(project, index)
+    if projects is not None:
+        projects.append(label)
+    return label
+
+
+def extract_snyk_vulns(data, convert=to_finding, projects=None) -> list:
     """
-    Génère un rapport HTML Snyk avec Tailwind CSS (via CDN).
+    ``vulnerabilities[]`` d'un JSON Snyk déjà chargé, en ``Finding`` : un
+    objet, ou le tableau de projets de ``--all-projects``. ``projects`` : liste
+    complétée avec le nom de chaque projet du tableau, sans vulnérabilité compris.
     """
-    vulns = data.get("vulnerabilities", [])
+    if isinstance(data, list):
+        return [
+            f
+            for index, project in enumerate(data)
+            if isinstance(project, dict)
+            for f in _project_vulns(project, convert, _labelled(project, index, projects))
+        ]
+    return _project_vulns(data, convert)
+
+
+def iter_snyk_vulns(path: Path, convert=to_finding, projects=None):
+    """
+    Parcourt le JSON Snyk en streaming : une entrée de ``vulnerabilities[]``
+    à la fois (``Finding``), sans charger tout le fichier.
+    Pour un tableau de projets (``snyk test --all-projects``, plusieurs
+    images), les projets sont lus un par un : un seul est en mémoire à la fois,
+    et leur nom est ajouté à ``projects`` (si fourni) au fil de la lecture.
+    Lève ``json.JSONDecodeError`` si le fichier n'est pas un JSON unique valide.
+    """
+    if top_level(path) == "[":
+        for index, (_, project) in enumerate(iter_items(path, (EACH,))):
+            if isinstance(project, dict):
+                yield from _project_vulns(project, convert, _labelled(project, index, projects))
+        return
+    for _, vuln in iter_items(path, ("vulnerabilities", EACH)):
+        if isinstance(vuln, dict):
+            yield convert(vuln)
+
+
+def load_snyk_findings(path: Path, convert=to_finding, projects=None):
+    """
+    Vulnérabilités Snyk du rapport (lecture en streaming, chargement complet en
+    fallback pour les sorties CLI à plusieurs documents). ``None`` si le
+    fichier est absent ou ne contient aucun JSON exploitable. ``projects`` :
+    voir ``iter_snyk_vulns``.
+    """
+    if not path.exists():
+        print(f"❌ Fichier Snyk introuvable: {path}")
+        return None
 
+    try:
+        return list(iter_snyk_vulns(path, convert, projects))
+    except json.JSONDecodeError:
+        if projects is not None:
+            del projects[:]
+        # Fallback : sortie CLI avec plusieurs documents JSON, chargement complet
+        data = load_snyk_json(path)
+        if not data:
+            return None
+        return extract_snyk_vulns(data, convert, projects)
+
+
+TAILWIND_MARKER = "<!-- tailwind.css -->"
+
+
+def _inline_tailwind(html: str) -> str:
+    """Remplace ``TAILWIND_MARKER`` par la feuille Tailwind précompilée."""
+    return html.replace(TAILWIND_MARKER, f"<style>\n{stylesheet('snyk-tailwind')}</style>", 1)
+
+
+def render_html(vulns: list) -> str:
+    """
+    Génère un rapport HTML Snyk avec Tailwind CSS : feuille précompilée et
+    purgée (``assets/snyk-tailwind.css``), inline, sans CDN.
+    """
     # Cas sans vulnérabilités : belle page "tout est vert"
     if not vulns:
-        return """<!DOCTYPE html>
+        return _inline_tailwind("""<!DOCTYPE html>
 <html lang="fr">
   <head>
     <meta charset="UTF-8" />
     <title>Rapport Snyk</title>
-    <script src="https://cdn.tailwindcss.com"></script>
+    <!-- tailwind.css -->
   </head>
   <body class="min-h-screen bg-slate-950 text-slate-50 flex items-center justify-center p-6">
     <main class="max-w-2xl w-full bg-slate-900/80 border border-slate-800 rounded-2xl shadow-2xl shadow-slate-900/80 p-8">
@@ -65,13 +180,13 @@ def render_html(data: dict) -> str:
       </section>
     </main>
   </body>
-</html>"""
+</html>""")
 
     # Compter les vulnérabilités par sévérité
     severities = ["critical", "high", "medium", "low"]
     counts = {s: 0 for s in severities}
     for v in vulns:
-        sev = (v.get("severity") or "").lower()
+        sev = v.severity.lower()
         if sev in counts:
             counts[sev] += 1
 
@@ -93,13 +208,13 @@ def render_html(data: dict) -> str:
 
     rows = []
     for v in vulns:
-        sev = (v.get("severity") or "").lower()
-        pkg = v.get("packageName") or v.get("moduleName") or "n/a"
-        version = v.get("version") or "?"
-        title = v.get("title") or v.get("name") or ""
-        id_ = v.get("id") or ""
-        from_chain = " → ".join(v.get("from", [])) if v.get("from") else ""
-        url = v.get("url") or ""
+        sev = v.severity.lower()
+        pkg = v.pkg or "n/a"
+        version = v.version or "?"
+        title = v.title
+        id_ = v.vuln_id
+        from_chain = " → ".join(v.path)
+        url = v.url
 
         rows.append(f"""
         <article class="rounded-xl border border-slate-800 bg-slate-900/70 px-4 py-3 sm:px-5 sm:py-4 flex flex-col sm:flex-row gap-3 sm:gap-4">
@@ -132,7 +247,7 @@ def render_html(data: dict) -> str:
   <head>
     <meta charset="UTF-8" />
     <title>Rapport Snyk</title>
-    <script src="https://cdn.tailwindcss.com"></script>
+    <!-- tailwind.css -->
   </head>
   <body class="min-h-screen bg-slate-950 text-slate-50 p-4 sm:p-6">
     <main class="mx-auto max-w-5xl space-y-5">
@@ -178,32 +293,30 @@ def render_html(data: dict) -> str:
     </main>
   </body>
 </html>"""
-    return html
+    return _inline_tailwind(html)
 
 
-def render_html_pure(data: dict) -> str:
+def render_html_pure(vulns: list) -> str:
     """
     Variante du rapport Snyk avec du CSS pur (sans Tailwind) et un rendu clair type dashboard.
     """
-    vulns = data.get("vulnerabilities", [])
-
     # Compter par sévérité
     severities = ["critical", "high", "medium", "low"]
     counts = {s: 0 for s in severities}
     for v in vulns:
-        sev = (v.get("severity") or "").lower()
+        sev = v.severity.lower()
         if sev in counts:
             counts[sev] += 1
 
     # Lignes de tableau
     rows = []
     for v in vulns:
-        sev = (v.get("severity") or "").upper()
-        pkg = v.get("packageName") or v.get("moduleName") or "n/a"
-        version = v.get("version") or "?"
-        title = v.get("title") or v.get("name") or ""
-        id_ = v.get("id") or ""
-        url = v.get("url") or ""
+        sev = v.severity
+        pkg = v.pkg or "n/a"
+        version = v.version or "?"
+        title = v.title
+        id_ = v.vuln_id
+        url = v.url
 
         rows.append(
             f"<tr>"
@@ -452,228 +565,163 @@ def render_html_pure(data: dict) -> str:
 
 # --- Nouvelle version "dashboard" avec CSS externe (pour Jenkins / CSP) ---
 
-SNYK_DASHBOARD_CSS = """\
-* { box-sizing: border-box; }
-body {
-  margin: 0;
-  min-height: 100vh;
-  padding: 24px 16px 32px;
-  background: #f3f4f6;
-  font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-  color: #111827;
-}
-.page {
-  max-width: 1120px;
-  margin: 0 auto;
-}
-.header {
-  border-radius: 24px;
-  background: #ffffff;
-  border: 1px solid #e5e7eb;
-  padding: 22px 24px 18px;
-  box-shadow: 0 22px 50px rgba(148,163,184,0.25);
-}
-.eyebrow {
-  margin: 0 0 4px;
-  font-size: 11px;
-  letter-spacing: 0.16em;
-  text-transform: uppercase;
-  color: #4f46e5;
-}
-h1 {
-  margin: 0;
-  font-size: 22px;
-  letter-spacing: 0.03em;
-}
-.subtitle {
-  margin-top: 4px;
-  font-size: 13px;
-  color: #6b7280;
-}
-.summary-row {
-  margin-top: 10px;
-  font-size: 12px;
-  color: #4b5563;
-}
-.summary-pill {
-  display: inline-flex;
-  align-items: center;
-  border-radius: 999px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 2px 8px;
-}
-.summary-grid {
-  margin-top: 16px;
-  display: grid;
-  grid-template-columns: repeat(4, minmax(0,1fr));
-  gap: 10px;
-}
-.summary-card {
-  border-radius: 16px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 10px 12px;
-}
-.summary-label {
-  font-size: 11px;
-  text-transform: uppercase;
-  letter-spacing: 0.15em;
-  color: #9ca3af;
-  margin-bottom: 2px;
-}
-.summary-value {
-  font-size: 18px;
-  font-weight: 700;
-}
-.crit { color: #b91c1c; }
-.high { color: #dc2626; }
-.med { color: #d97706; }
-.low { color: #0369a1; }
-
-table {
-  width: 100%;
-  border-collapse: collapse;
-  margin-top: 18px;
-}
-thead th {
-  font-size: 11px;
-  text-transform: uppercase;
-  letter-spacing: 0.14em;
-  color: #9ca3af;
-  padding: 0 8px 4px;
-  text-align: left;
-  border-bottom: 1px solid #e5e7eb;
-}
-tbody tr + tr td {
-  border-top: 1px solid #f3f4f6;
-}
-td {
-  padding: 8px;
-  vertical-align: top;
-  font-size: 13px;
-}
-.sev {
-  width: 96px;
-  font-size: 11px;
-  font-weight: 600;
-  text-align: center;
-  border-radius: 999px;
-  padding: 4px 10px;
-  display: flex;
-  align-items: center;
-  justify-content: center;
-  border: none;
-}
-.sev-critical { background:#fef2f2; color:#b91c1c; border-color:#fecaca; }
-.sev-high { background:#fef2f2; color:#dc2626; border-color:#fecaca; }
-.sev-medium { background:#fffbeb; color:#d97706; border-color:#fde68a; }
-.sev-low { background:#eff6ff; color:#0369a1; border-color:#bfdbfe; }
-.sev-unknown { background:#e5e7eb; color:#374151; }
-.v-title {
-  margin: 0 0 2px;
-  font-size: 14px;
-  font-weight: 600;
-}
-.v-id {
-  margin: 0;
-  font-size: 12px;
-  color: #6b7280;
-}
-.v-id span {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-  color: #111827;
-}
-.v-meta {
-  margin-top: 6px;
-  display: flex;
-  flex-wrap: wrap;
-  gap: 6px;
-  font-size: 11px;
-}
-.chip {
-  border-radius: 999px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 2px 8px;
-  display: inline-flex;
-  align-items: center;
-  gap: 4px;
-}
-.chip-label {
-  color: #6b7280;
-}
-.chip-value {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-}
-.v-link {
-  margin-top: 6px;
-  font-size: 11px;
-}
-.v-link a {
-  color: #2563eb;
-  text-decoration: none;
-}
-.v-link a:hover {
-  text-decoration: underline;
-}
-.no-data {
-  text-align: center;
-  font-size: 13px;
-  color: #6b7280;
-  padding: 16px 0;
-}
-@media (max-width: 768px) {
-  .summary-grid { grid-template-columns: repeat(2, minmax(0,1fr)); }
-}
-"""
+# Indentation des lignes de maillon (classes dep-d0 à dep-d8 de snyk.css)
+PATH_DEPTHS = 8
 
+SEVERITY_LABELS = (("CRITICAL", "Critiques"), ("HIGH", "Hautes"), ("MEDIUM", "Moyennes"), ("LOW", "Basses"))
 
-def render_html_dashboard(data: dict) -> str:
-    """HTML principal qui référence la feuille CSS externe."""
-    vulns = data.get("vulnerabilities", [])
 
-    # Compter par sévérité
-    severities = ["critical", "high", "medium", "low"]
-    counts = {s: 0 for s in severities}
-    for v in vulns:
-        sev = (v.get("severity") or "").lower()
-        if sev in counts:
-            counts[sev] += 1
+def render_html_dashboard(vulns: list, out, delta=None, agg=None, projects=()):
+    """
+    HTML principal qui référence la feuille CSS externe.
+    La page est écrite au fil de l'eau dans ``out`` (fichier ouvert ou sink).
+    ``agg`` : agrégats déjà calculés (``aggregate(vulns)`` sinon).
+    ``projects`` : projets de ``--all-projects``, sans vulnérabilité compris.
+    """
+    rows, _ = render_tree_rows(vulns, projects)
+    write_page(out, _dashboard_layout(agg or aggregate(vulns), delta, projects), rows)
 
-    # Lignes du tableau
-    rows = []
+
+def render_html_dashboard_shards(
+    vulns: list, out_dir: Path, rows_per_page: int, delta=None, agg=None, compress=False, projects=(), sink=None
+) -> list:
+    """
+    Variante découpée : ``snyk-report-001.html``... de ``rows_per_page``
+    lignes chacune (maillons de chemin compris), et ``snyk-report.html``
+    comme index avec le résumé.
+    """
+    rows, total = render_tree_rows(vulns, projects)
+    return write_sharded(
+        out_dir,
+        "snyk-report",
+        _dashboard_layout(agg or aggregate(vulns), delta, projects),
+        rows,
+        total,
+        rows_per_page,
+        compress,
+        sink,
+    )
+
+
+def render_html_dashboard_virtual(vulns: list, out, delta=None, agg=None, projects=()):
+    """
+    Variante "tableau virtualisé" : findings embarqués en JSON compact, seules
+    les lignes visibles sont créées par le navigateur.
+    """
+    from reportlib.virtual import write_virtual_page  # chargé seulement pour ce mode
+
+    write_virtual_page(out, _dashboard_layout(agg or aggregate(vulns), delta, projects), vulns)
+
+
+def render_tree_rows(vulns: list, projects=()) -> tuple:
+    """
+    Lignes du tableau groupées par chemin de dépendance (``reportlib.deptree``) :
+    une ligne par maillon, affiché une seule fois quel que soit le nombre de
+    chemins qui le traversent, suivie des vulnérabilités dont le chemin s'y
+    arrête. Avec plusieurs projets (``--all-projects``), une section par
+    projet, chacune avec son arbre ; les projets de ``projects`` sans
+    vulnérabilité ont aussi la leur (compteurs à zéro). Renvoie ``(lignes,
+    nombre de lignes)``.
+    """
+    groups = {project: [] for project in projects}
     for v in vulns:
-        sev = (v.get("severity") or "").lower()
-        pkg = v.get("packageName") or v.get("moduleName") or "n/a"
-        version = v.get("version") or "?"
-        title = v.get("title") or v.get("name") or ""
-        id_ = v.get("id") or ""
-        from_chain = " → ".join(v.get("from", [])) if v.get("from") else ""
-        url = v.get("url") or ""
+        groups.setdefault(v.target, []).append(v)
+    sections = [(project, findings, list(walk(build_tree(findings)))) for project, findings in groups.items()]
+    total = len(vulns) + sum(
+        bool(project) + sum(1 for _, names, _, _ in nodes if names) for project, _, nodes in sections
+    )
 
-        rows.append(
-            f"<tr>"
-            f"<td class='sev sev-{escape(sev or 'unknown')}'>{escape((sev or 'UNKNOWN').upper())}</td>"
-            f"<td class='col-main'>"
-            f"<div class='v-title'>{escape(title or id_)}</div>"
-            f"<p class='v-id'>ID : <span>{escape(id_ or 'N/A')}</span></p>"
-            f"<div class='v-meta'>"
-            f"<span class='chip'><span class='chip-label'>Package</span><span class='chip-value'>{escape(pkg)}@{escape(str(version))}</span></span>"
-            f"{f'<span class=\"chip\"><span class=\"chip-label\">Chemin</span><span class=\"chip-value\">{escape(from_chain)}</span></span>' if from_chain else ''}"
-            f"</div>"
-            f"</td></tr>"
-        )
+    def rows():
+        for project, findings, nodes in sections:
+            if project:
+                yield render_project_row(project, findings)
+            for depth, names, count, node_findings in nodes:
+                if names:
+                    yield render_path_row(depth, names, count)
+                for v in node_findings:
+                    yield render_dashboard_row(v)
+
+    return rows(), total
+
+
+def render_project_row(project: str, findings: list) -> str:
+    """En-tête de section d'un projet : nom, total et nombre par sévérité."""
+    counts = count_by_severity(findings)
+    pills = "".join(
+        f"<span class='project-sev sev-{sev.lower()}'>{label} : {counts[sev]}</span>"
+        for sev, label in SEVERITY_LABELS
+    )
+    return (
+        f"<tr class='project-row'><td colspan='2'>"
+        f"<span class='project-name'>{escape(project)}</span>"
+        f"<span class='project-total'>{len(findings)} vulnérabilité(s)</span>"
+        f"{pills}"
+        f"</td></tr>"
+    )
 
-    body_rows = "".join(rows) if rows else (
-        "<tr><td colspan='2' class='no-data'>Aucune vulnérabilité détectée.</td></tr>"
+
+def render_path_row(depth: int, names, count: int) -> str:
+    """Ligne de maillon : ``names`` (fusionnés), indentés selon ``depth``, et le nombre de findings du sous-arbre."""
+    return (
+        f"<tr class='dep-node dep-d{min(depth, PATH_DEPTHS)}'><td colspan='2'>"
+        f"<span class='dep-path'>{escape(' → '.join(names))}</span>"
+        f"<span class='dep-count'>{count}</span>"
+        f"</td></tr>"
+    )
+
+
+def render_dashboard_row(v: Finding) -> str:
+    """
+    Une ligne ``<tr>`` du tableau dashboard pour une vulnérabilité. Le chemin
+    complet reste affiché sous une ligne de maillon : la ligne se lit seule
+    (recherche, filtres, copier-coller) sans remonter l'arbre.
+    """
+    sev = v.severity.lower()
+    pkg = v.pkg or "n/a"
+    version = v.version or "?"
+    title = v.title
+    id_ = v.vuln_id
+    from_chain = " → ".join(v.path)
+
+    chain_chip = (
+        f'<span class="chip"><span class="chip-label">Chemin</span>'
+        f'<span class="chip-value">{escape(from_chain)}</span></span>'
+    ) if from_chain else ""
+
+    return (
+        f"<tr>"
+        f"<td class='sev sev-{escape(sev or 'unknown')}'>{escape((sev or 'UNKNOWN').upper())}</td>"
+        f"<td class='col-main'>"
+        f"<div class='v-title'>{delta_badge(v)}{escape(title or id_)}</div>"
+        f"<p class='v-id'>ID : <span>{escape(id_ or 'N/A')}</span></p>"
+        f"<div class='v-meta'>"
+        f"<span class='chip'><span class='chip-label'>Package</span><span class='chip-value'>{escape(pkg)}@{escape(str(version))}</span></span>"
+        f"{chain_chip}"
+        f"</div>"
+        f"</td></tr>"
+    )
+
+
+def _dashboard_layout(agg, delta=None, projects=()) -> PageLayout:
+    return PageLayout(
+        start=_dashboard_header(agg.total, agg.counts, len(set(projects)) or len(agg.targets))
+        + breakdown_html(agg, target_label="Projets")
+        + delta_summary(delta),
+        table_start=DASHBOARD_TABLE_START,
+        table_end=DASHBOARD_TABLE_END,
+        end=DASHBOARD_PAGE_END,
+        empty_row="<tr><td colspan='2' class='no-data'>Aucune vulnérabilité détectée.</td></tr>",
     )
 
+
+def _dashboard_header(total: int, counts: dict, projects: int = 0) -> str:
+    projects_pill = f'<span class="summary-pill">Projets : <strong>{projects}</strong></span>' if projects else ""
     return f"""<!DOCTYPE html>
 <html lang="fr">
   <head>
     <meta charset="UTF-8" />
     <title>Rapport Snyk</title>
+    {base_stylesheet_link()}
     <link rel="stylesheet" href="snyk-report.css" />
   </head>
   <body>
@@ -683,26 +731,29 @@ def render_html_dashboard(data: dict) -> str:
         <h1>Rapport Snyk</h1>
         <p class="subtitle">Analyse des vulnérabilités dans les dépendances du projet.</p>
         <div class="summary-row">
-          <span class="summary-pill">Total : <strong>{len(vulns)}</strong></span>
+          <span class="summary-pill">Total : <strong>{total}</strong></span>{projects_pill}
         </div>
         <div class="summary-grid">
           <div class="summary-card">
             <div class="summary-label">Critiques</div>
-            <div class="summary-value crit">{counts["critical"]}</div>
+            <div class="summary-value crit">{counts["CRITICAL"]}</div>
           </div>
           <div class="summary-card">
             <div class="summary-label">Hautes</div>
-            <div class="summary-value high">{counts["high"]}</div>
+            <div class="summary-value high">{counts["HIGH"]}</div>
           </div>
           <div class="summary-card">
             <div class="summary-label">Moyennes</div>
-            <div class="summary-value med">{counts["medium"]}</div>
+            <div class="summary-value med">{counts["MEDIUM"]}</div>
           </div>
           <div class="summary-card">
             <div class="summary-label">Basses</div>
-            <div class="summary-value low">{counts["low"]}</div>
+            <div class="summary-value low">{counts["LOW"]}</div>
           </div>
-        </div>
+        </div>"""
+
+
+DASHBOARD_TABLE_START = """
         <table>
           <thead>
             <tr>
@@ -711,28 +762,39 @@ def render_html_dashboard(data: dict) -> str:
             </tr>
           </thead>
           <tbody>
-{body_rows}
+"""
+
+DASHBOARD_TABLE_END = """
           </tbody>
-        </table>
+        </table>"""
+
+DASHBOARD_PAGE_END = """
       </section>
     </main>
   </body>
 </html>"""
-def main():
-    json_path = Path("reports/snyk/snyk-report.json")
-    data = load_snyk_json(json_path)
-    if not data:
-        return
 
-    # Écrit la feuille de style externe pour Jenkins / navigateur
-    css_path = Path("reports/snyk/snyk-report.css")
-    css_path.write_text(SNYK_DASHBOARD_CSS, encoding="utf-8")
 
+def main(argv=None):
+    args = build_parser("Génère le rapport HTML Snyk.").parse_args(argv)
+    # Projets de --all-projects (sans vulnérabilité compris), remplis à la lecture
+    projects = []
     # Utilise la version dashboard qui référence la CSS externe
-    html = render_html_dashboard(data)
-    out = Path("reports/snyk/snyk-report.html")
-    out.write_text(html, encoding="utf-8")
-    print(f"✅ Rapport HTML Snyk généré : {out}")
+    run_report(
+        args,
+        tool="snyk",
+        title="Rapport HTML Snyk",
+        json_path=Path("reports/snyk/snyk-report.json"),
+        out=Path("reports/snyk/snyk-report.html"),
+        generator_file=__file__,
+        load=functools.partial(load_snyk_findings, projects=projects),
+        convert=to_finding,
+        renderers=Renderers(
+            page=functools.partial(render_html_dashboard, projects=projects),
+            virtual=functools.partial(render_html_dashboard_virtual, projects=projects),
+            shards=functools.partial(render_html_dashboard_shards, projects=projects),
+        ),
+    )
 
 
 if __name__ == "__main__":
@@ -1,12 +1,25 @@
+import functools
 import json
 from html import escape
 from pathlib import Path
 
+from reportlib.aggregate import aggregate, breakdown_html
+from reportlib.assets import base_stylesheet_link
+from reportlib.cli import build_parser
+from reportlib.cvss import pick_trivy_cvss
+from reportlib.details import details_script, details_toggle
+from reportlib.delta import delta_badge, delta_summary
+from reportlib.json_stream import EACH, iter_items, pick_document
+from reportlib.model import SEVERITIES, Finding, as_list, dedupe_findings, format_score
+from reportlib.pages import PageLayout, write_page, write_sharded
+from reportlib.runner import Renderers, run_report
+from reportlib.templates import Fragment
+
 
 def load_trivy_json(path: Path):
     """
     Charge le JSON Trivy de façon robuste.
-    Gère à la fois un JSON unique et, en fallback, un fichier avec plusieurs lignes JSON.
+    Gère à la fois un JSON unique et, en fallback, un fichier avec plusieurs documents JSON.
     """
     if not path.exists():
         print(f"❌ Fichier Trivy introuvable: {path}")
@@ -16,123 +29,219 @@ def load_trivy_json(path: Path):
     try:
         return json.loads(content)
     except json.JSONDecodeError:
-        # Fallback : essayer ligne par ligne (cas où Trivy écrirait plusieurs JSON)
-        for line in reversed(content.splitlines()):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                return json.loads(line)
-            except json.JSONDecodeError:
-                continue
+        # Fallback : plusieurs documents JSON (ou du bruit autour), on garde le dernier
+        data = pick_document(content, "last", keys=("SchemaVersion", "Results"))
+        if data is not None:
+            return data
         print("❌ Aucun JSON valide trouvé dans le rapport Trivy.")
         return None
 
 
-def render_html(vulns):
+def to_finding(v: dict, target: str = "", references: bool = False) -> Finding:
+    """
+    Convertit une entrée ``Vulnerabilities[]`` de Trivy en ``Finding``
+    (avec ses liens ``References`` si ``references``).
+    """
+    # CVSS (score + éventuel vecteur) : source choisie selon reportlib.cvss.VENDOR_PRIORITY
+    cvss_score, cvss_vector = pick_trivy_cvss(v.get("CVSS"))
+
+    vuln_id = v.get("VulnerabilityID") or ""
+    return Finding(
+        tool="trivy",
+        severity=v.get("Severity"),
+        vuln_id=vuln_id,
+        title=v.get("Title"),
+        description=(v.get("Description") or "").strip(),
+        pkg=v.get("PkgName"),
+        version=v.get("InstalledVersion"),
+        fixed=v.get("FixedVersion"),
+        cvss_score=cvss_score,
+        cvss_vector=cvss_vector,
+        cwes=as_list(v.get("CweIDs") or v.get("CweID")),
+        cves=[vuln_id] if vuln_id.startswith("CVE-") else [],
+        url=v.get("PrimaryURL"),
+        target=target,
+        references=as_list(v.get("References")) if references else (),
+    )
+
+
+def iter_trivy_vulns(path: Path, convert=to_finding):
+    """
+    Parcourt le JSON Trivy en streaming : une vulnérabilité de
+    ``Results[].Vulnerabilities[]`` à la fois (``Finding``), sans charger tout
+    le fichier. Lève ``json.JSONDecodeError`` si le fichier n'est pas un JSON
+    unique valide.
+    """
+    if not path.exists():
+        print(f"❌ Fichier Trivy introuvable: {path}")
+        return
+
+    prefix = ("Results", EACH, "Vulnerabilities", EACH)
+    for ctx, vuln in iter_items(path, prefix, keep=("Target",)):
+        if isinstance(vuln, dict):
+            yield convert(vuln, ctx.get("Target") or "")
+
+
+def load_trivy_findings(path: Path, convert=to_finding) -> list:
+    """
+    Vulnérabilités Trivy retenues pour le rapport (sévérités connues, doublons
+    inter-cibles fusionnés). Lecture en streaming, chargement complet en
+    fallback si le fichier n'est pas un JSON unique. ``convert`` transforme
+    une entrée brute en ``Finding`` (``to_finding`` par défaut).
+    """
+    all_vulns = []
+    try:
+        for vuln in iter_trivy_vulns(path, convert):
+            if vuln.severity in SEVERITIES:
+                all_vulns.append(vuln)
+    except json.JSONDecodeError:
+        # Fallback : fichier non standard (plusieurs JSON), chargement complet
+        all_vulns = []
+        data = load_trivy_json(path)
+        if data:
+            for target in data.get("Results", []):
+                for vuln in target.get("Vulnerabilities") or []:
+                    finding = convert(vuln, target.get("Target") or "")
+                    if finding.severity in SEVERITIES:
+                        all_vulns.append(finding)
+
+    # Une même CVE sur le même package@version vue par plusieurs cibles/couches
+    # n'est affichée (et comptée) qu'une fois
+    return dedupe_findings(all_vulns)
+
+
+def render_html(vulns, out, delta=None, agg=None, details=False):
     """
     Génère un rapport HTML Trivy avec du CSS pur (sans Tailwind) et CSS EXTERNE.
+    La page est écrite au fil de l'eau dans ``out`` (fichier ouvert ou sink).
+    ``agg`` : agrégats déjà calculés (``aggregate(vulns)`` sinon) ; ``details`` :
+    descriptions dans le JSON annexe (voir ``reportlib.details``).
+    """
+    write_page(out, _layout(agg or aggregate(vulns), delta, details), (render_row(v, details) for v in vulns))
+
+
+def render_html_shards(
+    vulns, out_dir: Path, rows_per_page: int, delta=None, agg=None, details=False, compress=False, sink=None
+) -> list:
+    """
+    Variante découpée : ``trivy-report-001.html``... de ``rows_per_page``
+    lignes chacune, et ``trivy-report.html`` comme index avec le résumé.
+    """
+    return write_sharded(
+        out_dir,
+        "trivy-report",
+        _layout(agg or aggregate(vulns), delta, details),
+        (render_row(v, details) for v in vulns),
+        len(vulns),
+        rows_per_page,
+        compress,
+        sink,
+    )
+
+
+def render_html_virtual(vulns: list, out, delta=None, agg=None):
     """
-    # Compter par sévérité
-    severities = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
-    counts = {s: 0 for s in severities}
-    for v in vulns:
-        sev = (v.get("Severity") or "").upper()
-        if sev in counts:
-            counts[sev] += 1
-
-    # Construire les lignes (une par vulnérabilité)
-    rows = []
-    for v in vulns:
-        sev = (v.get("Severity") or "").upper()
-        vuln_id = v.get("VulnerabilityID", "N/A")
-        title = v.get("Title", "") or vuln_id
-        pkg = v.get("PkgName", "N/A")
-        installed = v.get("InstalledVersion", "?")
-        fixed = v.get("FixedVersion", "N/A")
-        # CVSS (score + éventuel vecteur)
-        cvss_score = ""
-        cvss_vector = ""
-        if v.get("CVSS"):
-            metrics = next(iter(v["CVSS"].values()), {})
-            cvss_score = str(metrics.get("V3Score") or metrics.get("V2Score") or "")
-            cvss_vector = str(
-                metrics.get("V3Vector")
-                or metrics.get("V2Vector")
-                or metrics.get("Vector")
-                or ""
-            )
-
-        # CWE (liste ou simple identifiant)
-        cwes = v.get("CweIDs") or v.get("CweID") or []
-        if isinstance(cwes, str):
-            cwes = [cwes]
-        cwe_label = ", ".join(str(c) for c in cwes) if cwes else ""
-
-        # Description courte (tronquée pour l'UI)
-        raw_desc = (v.get("Description") or "").strip()
-        if raw_desc:
-            short = raw_desc if len(raw_desc) <= 400 else raw_desc[:400] + "..."
-            desc_html = escape(short)
-        else:
-            desc_html = "Pas de description détaillée fournie."
-
-        primary_url = v.get("PrimaryURL") or ""
-
-        row = (
-            f"<tr class='row-{escape(sev.lower())}'>"
-            f"<td class='sev sev-{escape(sev.lower())}'>{escape(sev or 'UNKNOWN')}</td>"
-            f"<td class='col-main'>"
-            f"<div class='v-title'>{escape(title)}</div>"
-            f"<p class='v-id'>ID : <span>{escape(vuln_id)}</span></p>"
-            f"<div class='v-meta'>"
-            f"<span class='chip'><span class='chip-label'>Package</span>"
-            f"<span class='chip-value'>{escape(pkg)}@{escape(str(installed))}</span></span>"
-            f"<span class='chip'><span class='chip-label'>Fix</span>"
-            f"<span class='chip-value'>{escape(str(fixed))}</span></span>"
-        )
-        if cvss_score:
-            row += (
-                f"<span class='chip'><span class='chip-label'>CVSS</span>"
-                f"<span class='chip-value'>{escape(cvss_score)}</span></span>"
-            )
-        if cvss_vector:
-            row += (
-                f"<span class='chip'><span class='chip-label'>Vecteur</span>"
-                f"<span class='chip-value'>{escape(cvss_vector)}</span></span>"
-            )
-        if cwe_label:
-            row += (
-                f"<span class='chip'><span class='chip-label'>CWE</span>"
-                f"<span class='chip-value'>{escape(cwe_label)}</span></span>"
-            )
-
-        row += "</div>"  # fin v-meta
-
-        # Description
-        row += f"<p class='v-desc'>{desc_html}</p>"
-
-        # URL principale (source) – affichée de façon discrète
-        if primary_url:
-            safe_url = escape(primary_url)
-            row += (
-                f"<p class='v-source'>Source : "
-                f"<a href=\"{safe_url}\" target=\"_blank\" rel=\"noreferrer noopener\">{safe_url}</a>"
-                f"</p>"
-            )
-
-        row += "</td></tr>"
-        rows.append(row)
-
-    body_rows = "".join(rows) if rows else (
-        "<tr><td colspan='2' class='no-data'>Aucune vulnérabilité détectée.</td></tr>"
+    Variante "tableau virtualisé" : findings embarqués en JSON compact, seules
+    les lignes visibles sont créées par le navigateur.
+    """
+    from reportlib.virtual import write_virtual_page  # chargé seulement pour ce mode
+
+    write_virtual_page(out, _layout(agg or aggregate(vulns), delta), vulns)
+
+
+def render_row(v: Finding, details: bool = False) -> str:
+    """
+    Une ligne ``<tr>`` du tableau pour une vulnérabilité (assemblée à partir de
+    fragments précompilés). Avec ``details``, la description, le vecteur et
+    le lien source sont remplacés par un bloc chargé à la demande.
+    """
+    sev = v.severity
+    vuln_id = v.vuln_id or "N/A"
+
+    # Chips : champs très répétés, échappés et assemblés une fois par valeur distincte
+    chips = _package_chip(v.pkg or "N/A", v.version or "?") + _fix_chip(v.fixed or "N/A")
+    if v.cvss_score is not None:
+        chips += _cvss_chip(format_score(v.cvss_score))
+    if v.cvss_vector and not details:
+        chips += _vector_chip(v.cvss_vector)
+    if v.cwes:
+        chips += _cwe_chip(", ".join(v.cwes))
+    if v.targets:
+        chips += _targets_chip(v.targets)
+
+    # Description courte (tronquée pour l'UI), ou chargée à la demande
+    raw_desc = v.description
+    if details:
+        body = details_toggle(v.vuln_id)
+    elif raw_desc:
+        body = _DESC(escape(raw_desc if len(raw_desc) <= 400 else raw_desc[:400] + "..."))
+    else:
+        body = _DESC("Pas de description détaillée fournie.")
+
+    # URL principale (source) – affichée de façon discrète
+    source = ""
+    if v.url and not details:
+        safe_url = escape(v.url)
+        source = _SOURCE(safe_url, safe_url)
+
+    return _ROW(
+        _row_open(sev),
+        delta_badge(v),
+        escape(v.title or vuln_id),
+        escape(vuln_id),
+        chips,
+        body,
+        source,
+    )
+
+
+_ROW = Fragment(
+    "{}{}{}</div>"
+    "<p class='v-id'>ID : <span>{}</span></p>"
+    "<div class='v-meta'>{}</div>"
+    "{}{}</td></tr>"
+)
+_DESC = Fragment("<p class='v-desc'>{}</p>")
+_CHIP = Fragment("<span class='chip'><span class='chip-label'>{}</span><span class='chip-value'>{}</span></span>")
+_SOURCE = Fragment(
+    "<p class='v-source'>Source : <a href=\"{}\" target=\"_blank\" rel=\"noreferrer noopener\">{}</a></p>"
+)
+_package_chip = Fragment(_CHIP("Package", "{}@{}")).memo(maxsize=16384)
+_fix_chip = Fragment(_CHIP("Fix", "{}")).memo()
+_cvss_chip = Fragment(_CHIP("CVSS", "{}")).memo(maxsize=128)
+_vector_chip = Fragment(_CHIP("Vecteur", "{}")).memo()
+_cwe_chip = Fragment(_CHIP("CWE", "{}")).memo()
+
+
+@functools.lru_cache(maxsize=16)
+def _row_open(sev: str) -> str:
+    low = escape(sev.lower())
+    return f"<tr class='row-{low}'><td class='sev sev-{low}'>{escape(sev or 'UNKNOWN')}</td><td class='col-main'><div class='v-title'>"
+
+
+@functools.lru_cache(maxsize=4096)
+def _targets_chip(targets: tuple) -> str:
+    label = "Cible" if len(targets) == 1 else f"Cibles ({len(targets)})"
+    return _CHIP(label, escape(", ".join(targets)))
+
+
+def _layout(agg, delta=None, details=False) -> PageLayout:
+    return PageLayout(
+        start=_page_start(agg.counts) + breakdown_html(agg, target_label="Cibles") + delta_summary(delta),
+        table_start=TABLE_START,
+        table_end=TABLE_END,
+        end=(details_script("trivy-report") if details else "") + PAGE_END,
+        empty_row="<tr><td colspan='2' class='no-data'>Aucune vulnérabilité détectée.</td></tr>",
     )
 
-    html = f"""<!DOCTYPE html>
+
+def _page_start(counts: dict) -> str:
+    return f"""<!DOCTYPE html>
 <html lang="fr">
   <head>
     <meta charset="UTF-8" />
     <title>Rapport Trivy</title>
+    {base_stylesheet_link()}
     <link rel="stylesheet" href="trivy-report.css" />
   </head>
   <body>
@@ -158,7 +267,10 @@ def render_html(vulns):
             <div class="summary-label">Basses</div>
             <div class="summary-value low">{counts["LOW"]}</div>
           </div>
-        </div>
+        </div>"""
+
+
+TABLE_START = """
         <table>
           <thead>
             <tr>
@@ -167,222 +279,39 @@ def render_html(vulns):
             </tr>
           </thead>
           <tbody>
-{body_rows}
+"""
+
+TABLE_END = """
           </tbody>
-        </table>
+        </table>"""
+
+PAGE_END = """
       </section>
     </main>
   </body>
 </html>"""
-    return html
-
-
-TRIVY_DASHBOARD_CSS = """\
-* { box-sizing: border-box; }
-body {
-  margin: 0;
-  min-height: 100vh;
-  padding: 24px 16px 32px;
-  background: #f9fafb;
-  font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-  color: #111827;
-}
-.page {
-  max-width: 1120px;
-  margin: 0 auto;
-}
-.header {
-  border-radius: 24px;
-  background: #ffffff;
-  border: 1px solid #e5e7eb;
-  padding: 22px 24px 18px;
-  box-shadow: 0 22px 50px rgba(148,163,184,0.25);
-}
-.eyebrow {
-  margin: 0 0 4px;
-  font-size: 11px;
-  letter-spacing: 0.16em;
-  text-transform: uppercase;
-  color: #0369a1;
-}
-h1 {
-  margin: 0;
-  font-size: 22px;
-  letter-spacing: 0.03em;
-}
-.subtitle {
-  margin-top: 4px;
-  font-size: 13px;
-  color: #6b7280;
-}
-.summary-grid {
-  margin-top: 16px;
-  display: grid;
-  grid-template-columns: repeat(4, minmax(0,1fr));
-  gap: 10px;
-}
-.summary-card {
-  border-radius: 16px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 10px 12px;
-}
-.summary-label {
-  font-size: 11px;
-  text-transform: uppercase;
-  letter-spacing: 0.15em;
-  color: #9ca3af;
-  margin-bottom: 2px;
-}
-.summary-value {
-  font-size: 18px;
-  font-weight: 700;
-}
-.crit { color: #b91c1c; }
-.high { color: #dc2626; }
-.med { color: #d97706; }
-.low { color: #0369a1; }
-
-table {
-  width: 100%;
-  border-collapse: collapse;
-  margin-top: 18px;
-}
-thead th {
-  font-size: 11px;
-  text-transform: uppercase;
-  letter-spacing: 0.14em;
-  color: #9ca3af;
-  padding: 0 8px 4px;
-  text-align: left;
-  border-bottom: 1px solid #e5e7eb;
-}
-tbody tr + tr td {
-  border-top: 1px solid #f3f4f6;
-}
-td {
-  padding: 8px;
-  vertical-align: top;
-  font-size: 13px;
-}
-.sev {
-  width: 96px;
-  font-size: 11px;
-  font-weight: 600;
-  text-align: center;
-  border-radius: 999px;
-  padding: 4px 10px;
-  display: flex;
-  align-items: center;
-  justify-content: center;
-  border: none;
-}
-.sev-critical { background:#fef2f2; color:#b91c1c; border-color:#fecaca; }
-.sev-high { background:#fef2f2; color:#dc2626; border-color:#fecaca; }
-.sev-medium { background:#fffbeb; color:#d97706; border-color:#fde68a; }
-.sev-low { background:#eff6ff; color:#0369a1; border-color:#bfdbfe; }
-.v-title {
-  margin: 0 0 2px;
-  font-size: 14px;
-  font-weight: 600;
-}
-.v-id {
-  margin: 0;
-  font-size: 12px;
-  color: #6b7280;
-}
-.v-id span {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-  color: #111827;
-}
-.v-desc {
-  margin-top: 6px;
-  font-size: 12px;
-  color: #374151;
-}
-.v-source {
-  margin-top: 4px;
-  font-size: 11px;
-  color: #6b7280;
-}
-.v-source a {
-  color: #2563eb;
-  text-decoration: none;
-}
-.v-source a:hover {
-  text-decoration: underline;
-}
-.v-meta {
-  margin-top: 6px;
-  display: flex;
-  flex-wrap: wrap;
-  gap: 6px;
-  font-size: 11px;
-}
-.chip {
-  border-radius: 999px;
-  border: 1px solid #e5e7eb;
-  background: #f9fafb;
-  padding: 2px 8px;
-  display: inline-flex;
-  align-items: center;
-  gap: 4px;
-}
-.chip-label {
-  color: #6b7280;
-}
-.chip-value {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-}
-.v-link {
-  margin-top: 6px;
-  font-size: 11px;
-}
-.v-link a {
-  color: #2563eb;
-  text-decoration: none;
-}
-.v-link a:hover {
-  text-decoration: underline;
-}
-.no-data {
-  text-align: center;
-  font-size: 13px;
-  color: #6b7280;
-  padding: 16px 0;
-}
-.row-critical td {
-  background: #fef2f2;
-}
-.row-high td {
-  background: #fff7ed;
-}
-@media (max-width: 768px) {
-  .summary-grid { grid-template-columns: repeat(2, minmax(0,1fr)); }
-}
-"""
-
 
-def main():
-    json_path = Path("reports/trivy/trivy-report.json")
-    data = load_trivy_json(json_path)
 
-    # Écrit la feuille de style externe pour Jenkins / navigateur
-    css_path = Path("reports/trivy/trivy-report.css")
-    css_path.parent.mkdir(parents=True, exist_ok=True)
-    css_path.write_text(TRIVY_DASHBOARD_CSS, encoding="utf-8")
-
-    all_vulns = []
-    if data:
-      for target in data.get("Results", []):
-        for vuln in target.get("Vulnerabilities", []):
-            if vuln.get("Severity") in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]:
-              all_vulns.append(vuln)
-
-    html = render_html(all_vulns)
-    output_path = Path("reports/trivy/trivy-report.html")
-    output_path.write_text(html, encoding="utf-8")
-    print(f"✅ Rapport HTML généré : {output_path}")
+def main(argv=None):
+    args = build_parser("Génère le rapport HTML Trivy.").parse_args(argv)
+    # Sans objet en mode virtualisé : le tableau n'affiche pas de description
+    details = args.lazy_details and not args.virtual
+    run_report(
+        args,
+        tool="trivy",
+        title="Rapport HTML",
+        json_path=Path("reports/trivy/trivy-report.json"),
+        out=Path("reports/trivy/trivy-report.html"),
+        generator_file=__file__,
+        load=load_trivy_findings,
+        convert=functools.partial(to_finding, references=True) if details else to_finding,
+        renderers=Renderers(
+            page=functools.partial(render_html, details=details),
+            virtual=render_html_virtual,
+            shards=functools.partial(render_html_shards, details=details),
+        ),
+        details=details,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+"""
+Requêtes sur l'historique SQLite des findings (voir ``reportlib/history.py``).
+
+Exemples :
+    python3 scripts/report_history.py first-seen CVE-2023-4863
+    python3 scripts/report_history.py trend --severity CRITICAL --builds 200
+    python3 scripts/report_history.py package openssl --builds 50
+    python3 scripts/report_history.py builds --limit 20
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from reportlib.history import connect
+from reportlib.model import SEVERITIES
+
+
+def _last_builds(tool) -> tuple:
+    """Sous-requête des N derniers builds versés (filtrés par outil si demandé)."""
+    if tool:
+        return "SELECT DISTINCT build FROM builds WHERE tool = ? ORDER BY build DESC LIMIT ?", [tool]
+    return "SELECT DISTINCT build FROM builds ORDER BY build DESC LIMIT ?", []
+
+
+def first_seen(conn, args):
+    rows = conn.execute(
+        "SELECT tool, MIN(build), MAX(build), COUNT(DISTINCT build), GROUP_CONCAT(DISTINCT pkg) "
+        "FROM findings WHERE cve = ? OR vuln_id = ? GROUP BY tool ORDER BY MIN(build)",
+        (args.id, args.id),
+    ).fetchall()
+    return ("Outil", "Premier build", "Dernier build", "Builds", "Packages"), rows
+
+
+def trend(conn, args):
+    builds, params = _last_builds(args.tool)
+    tool_filter = "AND f.tool = ?" if args.tool else ""
+    rows = conn.execute(
+        f"SELECT b.build, COUNT(f.build) FROM ({builds}) b "
+        f"LEFT JOIN findings f ON f.build = b.build AND f.severity = ? {tool_filter} "
+        "GROUP BY b.build ORDER BY b.build",
+        [*params, args.builds, args.severity, *([args.tool] if args.tool else [])],
+    ).fetchall()
+    return ("Build", args.severity), rows
+
+
+def package(conn, args):
+    builds, params = _last_builds(args.tool)
+    tool_filter = "AND f.tool = ?" if args.tool else ""
+    rows = conn.execute(
+        f"SELECT b.build, COUNT(f.build), GROUP_CONCAT(DISTINCT f.version) FROM ({builds}) b "
+        f"LEFT JOIN findings f ON f.build = b.build AND f.pkg = ? {tool_filter} "
+        "GROUP BY b.build ORDER BY b.build",
+        [*params, args.builds, args.name, *([args.tool] if args.tool else [])],
+    ).fetchall()
+    return ("Build", "Findings", "Versions"), rows
+
+
+def builds(conn, args):
+    rows = conn.execute(
+        "SELECT build, tool, total, ingested_at FROM builds "
+        "WHERE build IN (SELECT DISTINCT build FROM builds ORDER BY build DESC LIMIT ?) "
+        "ORDER BY build, tool",
+        (args.limit,),
+    ).fetchall()
+    return ("Build", "Outil", "Findings", "Versé le"), rows
+
+
+def print_table(headers, rows):
+    cells = [tuple("" if v is None else str(v) for v in row) for row in rows]
+    widths = [max([len(h)] + [len(r[i]) for r in cells]) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Tendances des vulnérabilités à partir de l'historique SQLite.")
+    parser.add_argument(
+        "--db",
+        default=os.environ.get("REPORT_HISTORY_DB"),
+        help="Base SQLite (défaut : $REPORT_HISTORY_DB).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("first-seen", help="Premier / dernier build où une CVE (ou un ID d'advisory) apparaît.")
+    p.add_argument("id")
+    p.set_defaults(query=first_seen)
+
+    p = sub.add_parser("trend", help="Nombre de findings d'une sévérité sur les N derniers builds.")
+    p.add_argument("--severity", default="CRITICAL", type=str.upper, choices=SEVERITIES)
+    p.add_argument("--builds", type=int, default=50)
+    p.add_argument("--tool")
+    p.set_defaults(query=trend)
+
+    p = sub.add_parser("package", help="Findings d'un package sur les N derniers builds.")
+    p.add_argument("name")
+    p.add_argument("--builds", type=int, default=50)
+    p.add_argument("--tool")
+    p.set_defaults(query=package)
+
+    p = sub.add_parser("builds", help="Derniers builds versés, par outil.")
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(query=builds)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.db or not Path(args.db).exists():
+        print(f"❌ Base d'historique introuvable : {args.db or '(REPORT_HISTORY_DB non défini)'}")
+        return 1
+
+    start = time.perf_counter()
+    conn = connect(args.db)
+    try:
+        headers, rows = args.query(conn, args)
+    finally:
+        conn.close()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if not rows:
+        print("Aucun résultat.")
+    else:
+        print_table(headers, rows)
+    print(f"({len(rows)} ligne(s), {elapsed:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
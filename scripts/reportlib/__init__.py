@@ -0,0 +1,23 @@
+"""
+Briques partagées par les générateurs de rapports (Trivy, Snyk, Dependency-Check).
+
+Les générateurs eux-mêmes (``scripts/generate_*_report.py``) sont importés à
+la demande via ``load_generator`` : ``python3 -m reportlib trivy`` ne charge
+que le code du rapport Trivy. Voir ``reportlib/__main__.py``.
+"""
+import importlib
+
+# nom -> (JSON attendu, module du générateur)
+GENERATORS = {
+    "trivy": ("reports/trivy/trivy-report.json", "generate_trivy_report"),
+    "snyk": ("reports/snyk/snyk-report.json", "generate_snyk_report"),
+    "dependency-check": ("target/dependency-check-report.json", "generate_dependencycheck_report"),
+}
+
+# Le consolidé relit lui-même les JSON des trois scanners
+CONSOLIDATED = "generate_consolidated_report"
+
+
+def load_generator(name: str):
+    """Module du générateur ``name`` (``consolidated`` compris), importé au premier appel."""
+    return importlib.import_module(CONSOLIDATED if name == "consolidated" else GENERATORS[name][1])
@@ -0,0 +1,28 @@
+"""
+``python3 -m reportlib [all|trivy|snyk|dependency-check|consolidated] [options]``
+
+Depuis ``scripts/`` (ou avec ``PYTHONPATH=scripts``). ``all`` (défaut) passe
+par ``generate_reports.py`` ; les autres noms n'importent que le générateur
+demandé. Les options sont celles des générateurs (``--rows-per-page``...).
+"""
+import importlib
+import sys
+
+from reportlib import GENERATORS, load_generator
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    name = argv.pop(0) if argv and not argv[0].startswith("-") else "all"
+
+    if name == "all":
+        return importlib.import_module("generate_reports").main(argv)
+    if name != "consolidated" and name not in GENERATORS:
+        print(f"❌ Générateur inconnu : {name} (choix : all, {', '.join(GENERATORS)}, consolidated)")
+        return 2
+
+    return load_generator(name).main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
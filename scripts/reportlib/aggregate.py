@@ -0,0 +1,95 @@
+"""
+Agrégats d'un rapport calculés en une seule passe sur les findings : nombre
+par sévérité (les cartes du résumé), packages les plus touchés, répartition
+par CWE et par cible (image Trivy, fichier Dependency-Check) et part des
+vulnérabilités qui ont une version corrigée.
+
+Les en-têtes de page sont écrits avant les lignes : les agrégats sont donc
+calculés une fois, avant le rendu, puis partagés par toutes les variantes
+(page unique, pages découpées, tableau virtualisé).
+"""
+import heapq
+from html import escape
+
+from reportlib.model import SEVERITIES
+
+TOP = 10
+
+
+class Aggregate:
+    """Compteurs d'un rapport (voir ``aggregate``)."""
+
+    __slots__ = ("total", "counts", "packages", "cwes", "targets", "fixable")
+
+    def __init__(self):
+        self.total = 0
+        self.counts = {s: 0 for s in SEVERITIES}
+        self.packages = {}
+        self.cwes = {}
+        self.targets = {}
+        self.fixable = 0
+
+    def top(self, field: str, n: int = TOP) -> list:
+        """Les ``n`` entrées les plus fréquentes de ``field`` : ``[(nom, nombre)]``, ex æquo par nom."""
+        return heapq.nsmallest(n, getattr(self, field).items(), key=lambda kv: (-kv[1], kv[0]))
+
+    @property
+    def fixable_pct(self) -> float:
+        return 100.0 * self.fixable / self.total if self.total else 0.0
+
+
+def aggregate(findings) -> Aggregate:
+    """Tous les compteurs en une passe O(n) (un accès dict par champ et par finding)."""
+    agg = Aggregate()
+    counts, packages, cwes, targets = agg.counts, agg.packages, agg.cwes, agg.targets
+    total = fixable = 0
+    for f in findings:
+        total += 1
+        if f.severity in counts:
+            counts[f.severity] += 1
+        if f.pkg:
+            packages[f.pkg] = packages.get(f.pkg, 0) + 1
+        for cwe in f.cwes:
+            cwes[cwe] = cwes.get(cwe, 0) + 1
+        for target in f.targets:
+            targets[target] = targets.get(target, 0) + 1
+        if f.fixed:
+            fixable += 1
+    agg.total = total
+    agg.fixable = fixable
+    return agg
+
+
+def _card(title: str, entries) -> str:
+    if not entries:
+        return ""
+    items = "".join(
+        f"<li><span class='breakdown-name' title='{escape(name)}'>{escape(name)}</span>"
+        f"<span class='breakdown-count'>{count}</span></li>"
+        for name, count in entries
+    )
+    return f"<div class='breakdown-card'><div class='breakdown-title'>{title}</div><ol>{items}</ol></div>"
+
+
+def breakdown_html(agg: Aggregate, package_label: str = "Packages", target_label=None, fixes: bool = True) -> str:
+    """
+    Bloc "répartition" sous les cartes de sévérité. ``target_label`` ``None``
+    masque la répartition par cible ; ``fixes=False`` masque la part
+    corrigeable (scanners qui ne donnent pas de version corrigée).
+    """
+    if not agg.total:
+        return ""
+    html = "\n        <div class='breakdown'>"
+    if fixes:
+        html += (
+            "<p class='breakdown-fix'>Version corrigée disponible : "
+            f"<strong>{agg.fixable}</strong> / {agg.total} ({agg.fixable_pct:.0f} %)"
+            f"<span class='breakdown-bar'><span style='width:{agg.fixable_pct:.1f}%'></span></span></p>"
+        )
+    cards = _card(f"Top {package_label.lower()}", agg.top("packages"))
+    cards += _card("CWE", agg.top("cwes"))
+    if target_label:
+        cards += _card(target_label, agg.top("targets"))
+    if cards:
+        html += f"<div class='breakdown-grid'>{cards}</div>"
+    return html + "</div>"
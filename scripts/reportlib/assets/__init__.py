@@ -0,0 +1,76 @@
+"""
+Feuilles de style des rapports, rangées en fichiers ``.css`` à côté de ce
+module et lues seulement quand un rapport est effectivement écrit (et une
+seule fois par processus).
+
+Les règles communes aux rapports (Trivy, Snyk, Dependency-Check, consolidé)
+sont publiées une fois dans ``reports/assets/report-base.<hash>.css`` : le nom
+change avec le contenu, le navigateur peut donc la garder en cache sans
+limite et la réutiliser d'un rapport à l'autre. Chaque rapport n'a plus que
+sa petite feuille de surcharges (``trivy.css``...).
+"""
+import functools
+import hashlib
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).parent
+
+# Feuille commune, dans l'ordre de concaténation
+BASE = ("base", "pager", "virtual", "delta", "breakdown", "details")
+BASE_DIR = "assets"
+
+
+@functools.lru_cache(maxsize=None)
+def _read(name: str) -> str:
+    return (ASSETS_DIR / f"{name}.css").read_text(encoding="utf-8")
+
+
+def stylesheet(*names: str) -> str:
+    """Concatène les feuilles ``<name>.css`` dans l'ordre donné."""
+    return "".join(_read(name) for name in names)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """
+    Écrit ``text`` dans ``path`` sauf si le fichier a déjà ce contenu (même
+    hash) : la date de modification ne bouge pas d'un build à l'autre.
+    Renvoie ``True`` si le fichier a été (ré)écrit.
+    """
+    data = text.encode("utf-8")
+    try:
+        if hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest():
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def base_stylesheet_name() -> str:
+    """``report-base.<hash>.css`` : hash du contenu source de la feuille commune."""
+    digest = hashlib.sha256(stylesheet(*BASE).encode("utf-8")).hexdigest()[:12]
+    return f"report-base.{digest}.css"
+
+
+def base_stylesheet_link() -> str:
+    """Balise ``<link>`` vers la feuille commune, depuis un dossier ``reports/<outil>/``."""
+    return f'<link rel="stylesheet" href="../{BASE_DIR}/{base_stylesheet_name()}" />'
+
+
+def publish_base_stylesheet(reports_dir: Path, compress: bool = False) -> Path:
+    """
+    Écrit la feuille commune dans ``<reports_dir>/assets/`` (si elle n'y est
+    pas déjà) et supprime les versions précédentes. Renvoie son chemin.
+    """
+    from reportlib.compress import write_text  # évite l'import circulaire
+
+    out_dir = Path(reports_dir) / BASE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = base_stylesheet_name()
+    for old in out_dir.glob("report-base.*.css*"):
+        if old.name != name and not old.name.startswith(name + "."):
+            old.unlink(missing_ok=True)
+    path = out_dir / name
+    write_text(path, stylesheet(*BASE), compress, css=True)
+    return path
@@ -0,0 +1,140 @@
+"""
+Cache de rendu adressé par contenu.
+
+La clé combine le hash du JSON du scanner, celui du code des générateurs
+(script + ``reportlib``) et les options de rendu. Si le scanner produit un
+JSON identique d'un build à l'autre (même image, même base), les fichiers
+HTML/CSS déjà générés sont recopiés tels quels, sans parsing ni rendu.
+
+Les options comprennent le hash des empreintes du build précédent
+(``reportlib.delta``) : les badges "Nouvelle" / "Toujours présente" et la
+liste des corrigées font partie du HTML. Pour un même JSON, le premier
+build n'a pas de précédent et le deuxième compare au premier (tout est
+"toujours présent") : leurs pages diffèrent, aucun n'est repris du cache.
+À partir du troisième build identique, les empreintes précédentes ne
+changent plus et le rendu est repris du cache.
+"""
+import functools
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+# À incrémenter si le format d'une entrée de cache change
+CACHE_FORMAT = "1"
+
+# Nombre d'entrées gardées dans le répertoire de cache (les plus récentes)
+MAX_ENTRIES = 30
+
+_READ_SIZE = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path: Path) -> str:
+    """SHA-256 d'un fichier d'entrée (calculé une fois par exécution)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(_READ_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(generator_file: str) -> str:
+    """Hash du script générateur, des modules ``reportlib`` et des feuilles de style."""
+    h = hashlib.sha256(CACHE_FORMAT.encode())
+    lib_dir = Path(__file__).parent
+    h.update(Path(generator_file).read_bytes())
+    # Sous-paquets compris (``assets/__init__.py``) ; chemin relatif dans le hash
+    sources = sorted(lib_dir.rglob("*.py")) + sorted(lib_dir.rglob("*.css"))
+    for path in sources:
+        h.update(path.relative_to(lib_dir).as_posix().encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class RenderCache:
+    """Une entrée du cache : ``<racine>/<clé>/`` + ``manifest.json``."""
+
+    def __init__(self, root: Path, key: str):
+        self.root = Path(root)
+        self.key = key
+        self.entry = self.root / key
+
+    @classmethod
+    def for_input(cls, root, input_path: Path, generator_file: str, options: dict):
+        """
+        Entrée correspondant à ``input_path`` + générateur + ``options`` ;
+        ``None`` si le cache est désactivé (pas de racine) ou le JSON absent.
+        """
+        if not root or not input_path.exists():
+            return None
+        h = hashlib.sha256()
+        h.update(file_digest(input_path).encode())
+        h.update(code_version(str(generator_file)).encode())
+        h.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return cls(root, h.hexdigest())
+
+    def restore(self, out_dir: Path):
+        """Recopie les fichiers en cache dans ``out_dir`` ; ``None`` si absent."""
+        manifest = self.entry / "manifest.json"
+        try:
+            names = json.loads(manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        restored = []
+        for name in names:
+            src = self.entry / name
+            if not src.is_file():
+                return None
+            shutil.copyfile(src, out_dir / name)
+            restored.append(out_dir / name)
+        os.utime(self.entry)
+        return restored
+
+    def store(self, files):
+        """Enregistre ``files`` (chemins générés) dans l'entrée, de façon atomique."""
+        import tempfile  # inutile sur un hit : chargé seulement ici
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.root, prefix=".tmp-"))
+        try:
+            names = []
+            for path in files:
+                path = Path(path)
+                shutil.copyfile(path, tmp / path.name)
+                names.append(path.name)
+            (tmp / "manifest.json").write_text(json.dumps(names), encoding="utf-8")
+            if self.entry.exists():
+                shutil.rmtree(self.entry)
+            tmp.rename(self.entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._prune()
+
+    def _prune(self):
+        entries = [p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith(".")]
+        if len(entries) <= MAX_ENTRIES:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in entries[MAX_ENTRIES:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+# Options sans effet sur le HTML produit
+_NOT_IN_KEY = ("cache_dir", "state_dir", "history_db", "build", "metrics", "metrics_log")
+
+
+def cache_options(args, **extra) -> dict:
+    """
+    Options qui entrent dans la clé : celles de la ligne de commande (sauf les
+    répertoires de travail) + ``extra`` (autres entrées qui changent le rendu).
+    """
+    options = {k: v for k, v in vars(args).items() if k not in _NOT_IN_KEY}
+    options.update(extra)
+    return options
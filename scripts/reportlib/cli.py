@@ -0,0 +1,96 @@
+"""
+Options de ligne de commande communes aux générateurs de rapports.
+"""
+import argparse
+import os
+
+# Options acceptées par tous les rapports, consolidé compris (voir ``output_argv``)
+OUTPUT_OPTIONS = ("compress", "metrics", "metrics_log")
+
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    layout = parser.add_mutually_exclusive_group()
+    layout.add_argument(
+        "--rows-per-page",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Découpe le rapport en pages de N lignes + une page d'index (0 = page unique).",
+    )
+    layout.add_argument(
+        "--virtual",
+        action="store_true",
+        help="Tableau virtualisé : données embarquées en JSON compact, seules les lignes visibles sont créées.",
+    )
+    parser.add_argument(
+        "--lazy-details",
+        action="store_true",
+        help="Trivy / Dependency-Check : une ligne de titre par vulnérabilité ; description complète, références "
+        "et vecteur CVSS dans un JSON gzip chargé à l'ouverture d'une ligne (sans effet avec --virtual).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("REPORT_CACHE_DIR"),
+        metavar="DIR",
+        help="Cache de rendu : si le JSON et le générateur n'ont pas changé, le HTML/CSS est repris tel quel "
+        "(défaut : $REPORT_CACHE_DIR, sinon désactivé).",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=os.environ.get("REPORT_STATE_DIR"),
+        metavar="DIR",
+        help="Où lire/republier les empreintes du build précédent (défaut : $REPORT_STATE_DIR, "
+        "sinon le répertoire du rapport).",
+    )
+    parser.add_argument(
+        "--history-db",
+        default=os.environ.get("REPORT_HISTORY_DB"),
+        metavar="FILE",
+        help="Base SQLite où verser les findings du build (défaut : $REPORT_HISTORY_DB, sinon désactivé).",
+    )
+    parser.add_argument(
+        "--build",
+        type=int,
+        default=_build_number(),
+        metavar="N",
+        help="Numéro de build pour l'historique (défaut : $BUILD_NUMBER).",
+    )
+    return add_output_options(parser)
+
+
+def add_output_options(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Options de sortie, communes à tous les rapports (consolidé compris)."""
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Minifie le HTML/CSS et écrit aussi des variantes .gz, compressées au fil du rendu.",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        default=os.environ.get("REPORT_METRICS") == "1",
+        help="Mesure chaque phase (load, normalize, aggregate, render, write) dans generator-metrics.json "
+        "(défaut : REPORT_METRICS=1).",
+    )
+    parser.add_argument(
+        "--metrics-log",
+        action="store_true",
+        help="Avec --metrics, affiche aussi un résumé d'une ligne.",
+    )
+    return parser
+
+
+def build_output_parser(description: str) -> argparse.ArgumentParser:
+    """Parser réduit aux options de sortie, pour le rapport consolidé."""
+    return add_output_options(argparse.ArgumentParser(description=description))
+
+
+def output_argv(args) -> list:
+    """Options de sortie de ``args`` (parsé par ``build_parser``) remises sous forme d'arguments."""
+    return [f"--{name.replace('_', '-')}" for name in OUTPUT_OPTIONS if getattr(args, name)]
+
+
+def _build_number():
+    value = os.environ.get("BUILD_NUMBER", "")
+    return int(value) if value.isdigit() else None
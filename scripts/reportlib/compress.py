@@ -0,0 +1,144 @@
+"""
+Sorties minifiées et précompressées (``--compress``).
+
+Le HTML passe par un sink "tee" : chaque bloc est minifié puis écrit à la
+fois dans ``rapport.html`` et ``rapport.html.gz``. Tout se fait au fil du
+rendu, sans relire le fichier. Les sorties compressées sont reproductibles
+(``mtime`` à 0 dans l'en-tête gzip). Un seul format compressé : gzip est lu
+partout (navigateurs, ``gzip_static`` de nginx) sans dépendance optionnelle.
+"""
+import gzip
+import re
+from pathlib import Path
+
+from reportlib.assets import write_if_changed
+
+VARIANTS = (".gz",)
+GZIP_LEVEL = 6
+
+# Blanc entre deux balises contenant un saut de ligne : indentation des gabarits
+_GAP = re.compile(r">\s*\n\s*<")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r"\s*([{};:,>])\s*")
+
+
+def variants(path: Path) -> list:
+    """Variantes compressées de ``path`` présentes sur disque."""
+    path = Path(path)
+    return [v for v in (path.with_name(path.name + ext) for ext in VARIANTS) if v.exists()]
+
+
+def clear_variants(path: Path):
+    """Supprime les ``.gz`` d'une exécution précédente."""
+    for v in variants(path):
+        v.unlink()
+
+
+def with_variants(paths) -> list:
+    """``paths`` suivis de leurs variantes compressées (liste pour le cache de rendu)."""
+    return [v for p in paths for v in (p, *variants(p))]
+
+
+def minify_css(text: str) -> str:
+    text = _CSS_COMMENT.sub("", text)
+    text = _CSS_SPACE.sub(" ", text)
+    return _CSS_PUNCT.sub(r"\1", text).replace(";}", "}").strip()
+
+
+class HtmlMinifier:
+    """
+    Supprime l'indentation entre balises, bloc par bloc. Un motif ``>…<`` peut
+    être coupé entre deux blocs : la fin d'un bloc (dernier ``>`` suivi
+    uniquement de blanc) est gardée pour le suivant.
+    """
+
+    def __init__(self):
+        self._tail = ""
+
+    def feed(self, text: str) -> str:
+        text = self._tail + text
+        cut = text.rfind(">")
+        if cut >= 0 and (cut == len(text) - 1 or text[cut + 1 :].isspace()):
+            text, self._tail = text[:cut], text[cut:]
+        else:
+            self._tail = ""
+        return _GAP.sub("><", text)
+
+    def flush(self) -> str:
+        text, self._tail = self._tail, ""
+        return _GAP.sub("><", text)
+
+
+class CompressedWriter:
+    """
+    Fichier texte de sortie qui écrit aussi ``.gz`` au fil de l'eau. S'utilise comme le fichier ouvert qu'il remplace (``write``,
+    gestionnaire de contexte).
+    """
+
+    def __init__(self, path: Path, minify: bool = True):
+        path = Path(path)
+        self.path = path
+        self._minifier = HtmlMinifier() if minify else None
+        self._raw = path.open("wb")
+        self._gz_file = path.with_name(path.name + ".gz").open("wb")
+        self._gz = gzip.GzipFile(filename="", mode="wb", fileobj=self._gz_file, compresslevel=GZIP_LEVEL, mtime=0)
+
+    def _emit(self, text: str):
+        if not text:
+            return
+        data = text.encode("utf-8")
+        self._raw.write(data)
+        self._gz.write(data)
+
+    def write(self, text: str):
+        self._emit(self._minifier.feed(text) if self._minifier else text)
+
+    def close(self):
+        if self._minifier:
+            self._emit(self._minifier.flush())
+        self._raw.close()
+        self._gz.close()
+        self._gz_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_output(path: Path, compress: bool = False):
+    """Fichier où écrire un rapport HTML : simple, ou minifié + précompressé."""
+    path = Path(path)
+    if compress:
+        return CompressedWriter(path)
+    clear_variants(path)
+    return path.open("w", encoding="utf-8")
+
+
+def write_text(path: Path, text: str, compress: bool = False, css: bool = False) -> bool:
+    """
+    ``write_if_changed`` pour une feuille de style (``css``) ou un petit
+    fichier texte, avec minification et variantes compressées si demandé.
+    """
+    path = Path(path)
+    if not compress:
+        clear_variants(path)
+        return write_if_changed(path, text)
+    if css:
+        text = minify_css(text)
+    changed = write_if_changed(path, text)
+    data = text.encode("utf-8")
+    gz = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    _write_bytes_if_changed(path.with_name(path.name + ".gz"), gz)
+    return changed
+
+
+def _write_bytes_if_changed(path: Path, data: bytes):
+    try:
+        if path.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    path.write_bytes(data)
@@ -0,0 +1,201 @@
+"""
+Vecteurs CVSS (v2, v3.0, v3.1, v4.0) : lecture, score de base et choix de la
+source quand un scanner en fournit plusieurs.
+
+Les mêmes quelques vecteurs reviennent sur des milliers de findings :
+lecture et calcul sont mémorisés par chaîne de vecteur (LRU), le coût par
+ligne se réduit à une recherche dans un dict.
+
+Le score fourni par le scanner reste la référence ; il n'est calculé depuis
+le vecteur que s'il manque. Pour CVSS v4, le vecteur est lu et validé mais
+le score n'est pas recalculé (il faudrait la table des "macrovecteurs" de la
+spécification) : seul le score fourni est utilisé.
+"""
+import functools
+import math
+
+from reportlib.model import as_score
+
+# Sources du champ ``CVSS`` de Trivy, par ordre de préférence ; les autres
+# viennent ensuite par ordre alphabétique (choix indépendant de l'ordre du JSON).
+VENDOR_PRIORITY = ("nvd", "ghsa", "redhat")
+
+# Versions essayées pour une même source, de la plus récente à la plus ancienne
+TRIVY_VERSIONS = (("V40Score", "V40Vector"), ("V3Score", "V3Vector"), ("V2Score", "V2Vector"))
+
+CACHE_SIZE = 1024
+
+# Métriques de base obligatoires et valeurs admises, par version
+_BASE_METRICS = {
+    "2": {
+        "AV": "LAN",
+        "AC": "HML",
+        "Au": "MSN",
+        "C": "NPC",
+        "I": "NPC",
+        "A": "NPC",
+    },
+    "3": {
+        "AV": "NALP",
+        "AC": "LH",
+        "PR": "NLH",
+        "UI": "NR",
+        "S": "UC",
+        "C": "HLN",
+        "I": "HLN",
+        "A": "HLN",
+    },
+    "4": {
+        "AV": "NALP",
+        "AC": "LH",
+        "AT": "NP",
+        "PR": "NLH",
+        "UI": "NPA",
+        "VC": "HLN",
+        "VI": "HLN",
+        "VA": "HLN",
+        "SC": "HLN",
+        "SI": "HLN",
+        "SA": "HLN",
+    },
+}
+
+_V2_WEIGHTS = {
+    "AV": {"L": 0.395, "A": 0.646, "N": 1.0},
+    "AC": {"H": 0.35, "M": 0.61, "L": 0.71},
+    "Au": {"M": 0.45, "S": 0.56, "N": 0.704},
+    "CIA": {"N": 0.0, "P": 0.275, "C": 0.660},
+}
+_V3_WEIGHTS = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "PR": {"N": 0.85, "L": 0.62, "H": 0.27},
+    # Privilèges requis quand la portée change (S:C)
+    "PR_C": {"N": 0.85, "L": 0.68, "H": 0.5},
+    "UI": {"N": 0.85, "R": 0.62},
+    "CIA": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_vector(vector: str):
+    """
+    ``(version, {métrique: valeur})`` d'un vecteur (``"2"``, ``"3.0"``,
+    ``"3.1"``, ``"4.0"``), ou ``None`` s'il est illisible ou incomplet. Un
+    vecteur sans préfixe ``CVSS:x.y/`` est lu comme du v2 (NVD, Red Hat).
+    """
+    text = (vector or "").strip().strip("()")
+    if not text:
+        return None
+    parts = text.split("/")
+    version = "2"
+    if parts[0].startswith("CVSS:"):
+        version = parts.pop(0)[5:]
+    major = version.split(".")[0]
+    allowed = _BASE_METRICS.get(major)
+    if allowed is None:
+        return None
+
+    metrics = {}
+    for part in parts:
+        name, sep, value = part.partition(":")
+        if not sep or name in metrics:
+            return None
+        metrics[name] = value
+    for name, values in allowed.items():
+        if metrics.get(name, "") == "" or metrics[name] not in values:
+            return None
+    return version, metrics
+
+
+def _roundup(value: float) -> float:
+    """Arrondi au dixième supérieur de CVSS v3.1 (sans erreur de flottant)."""
+    scaled = round(value * 100000)
+    if scaled % 10000 == 0:
+        return scaled / 100000
+    return (math.floor(scaled / 10000) + 1) / 10
+
+
+def _score_v2(m: dict) -> float:
+    w = _V2_WEIGHTS
+    cia = w["CIA"]
+    impact = 10.41 * (1 - (1 - cia[m["C"]]) * (1 - cia[m["I"]]) * (1 - cia[m["A"]]))
+    exploitability = 20 * w["AV"][m["AV"]] * w["AC"][m["AC"]] * w["Au"][m["Au"]]
+    f_impact = 0 if impact == 0 else 1.176
+    score = ((0.6 * impact) + (0.4 * exploitability) - 1.5) * f_impact
+    return math.floor(score * 10 + 0.5 + 1e-9) / 10
+
+
+def _score_v3(m: dict) -> float:
+    w = _V3_WEIGHTS
+    cia = w["CIA"]
+    changed = m["S"] == "C"
+    iss = 1 - (1 - cia[m["C"]]) * (1 - cia[m["I"]]) * (1 - cia[m["A"]])
+    if changed:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    else:
+        impact = 6.42 * iss
+    pr = w["PR_C" if changed else "PR"][m["PR"]]
+    exploitability = 8.22 * w["AV"][m["AV"]] * w["AC"][m["AC"]] * pr * w["UI"][m["UI"]]
+    if impact <= 0:
+        return 0.0
+    if changed:
+        return _roundup(min(1.08 * (impact + exploitability), 10))
+    return _roundup(min(impact + exploitability, 10))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def base_score(vector: str):
+    """
+    Score de base calculé depuis le vecteur (v2, v3.0, v3.1). ``None`` pour
+    un vecteur illisible ou v4 (voir l'en-tête du module).
+    """
+    parsed = parse_vector(vector)
+    if parsed is None:
+        return None
+    version, metrics = parsed
+    if version == "2":
+        return _score_v2(metrics)
+    if version.startswith("3"):
+        return _score_v3(metrics)
+    return None
+
+
+def resolve_score(score, vector: str = ""):
+    """Score fourni par le scanner s'il est lisible, sinon calculé depuis ``vector``."""
+    value = as_score(score)
+    if value is None and vector:
+        value = base_score(vector)
+    return value
+
+
+def _vendor_rank(vendor: str) -> tuple:
+    try:
+        return (VENDOR_PRIORITY.index(vendor), "")
+    except ValueError:
+        return (len(VENDOR_PRIORITY), vendor)
+
+
+def pick_trivy_cvss(cvss) -> tuple:
+    """
+    ``(score, vecteur)`` du champ ``CVSS`` de Trivy (``{source: {V3Score, V3Vector...}}``) :
+    première source selon ``VENDOR_PRIORITY``, puis version la plus récente
+    dont le score est connu (fourni, ou calculé depuis le vecteur). Score et
+    vecteur viennent toujours de la même version. Sans aucun score, le
+    premier vecteur trouvé est gardé (score ``None``).
+    """
+    if not isinstance(cvss, dict):
+        return None, ""
+    fallback = ""
+    for vendor in sorted(cvss, key=_vendor_rank):
+        metrics = cvss[vendor]
+        if not isinstance(metrics, dict):
+            continue
+        # Anciens rapports : vecteur seul, sans version dans le nom du champ
+        for score_key, vector_key in (*TRIVY_VERSIONS, (None, "Vector")):
+            vector = metrics.get(vector_key) or ""
+            score = resolve_score(metrics.get(score_key), vector)
+            if score is not None:
+                return score, vector
+            fallback = fallback or vector
+    return None, fallback
@@ -0,0 +1,166 @@
+"""
+Comparaison avec le build précédent.
+
+Chaque générateur garde, à côté de son rapport, un fichier
+``<stem>.fingerprints`` : une empreinte courte par finding (ID, package,
+version) + de quoi afficher une vulnérabilité corrigée. Au build suivant,
+la différence se calcule par ensembles sur ces empreintes, sans relire
+d'ancien JSON : chaque ligne est marquée nouvelle ou toujours présente, et
+les corrigées sont listées dans le résumé.
+"""
+import hashlib
+import shutil
+from html import escape
+from pathlib import Path
+
+from reportlib.model import SEVERITIES
+
+STATUS_NEW = "new"
+STATUS_SEEN = "seen"
+
+_HEADER = "# fingerprints v1\n"
+
+_BADGES = {
+    STATUS_NEW: "<span class='delta delta-new'>Nouvelle</span>",
+    STATUS_SEEN: "<span class='delta delta-seen'>Toujours présente</span>",
+}
+
+# Libellés du mode "tableau virtualisé" (reportlib.virtual)
+STATUS_LABELS = {STATUS_NEW: "Nouvelle", STATUS_SEEN: "Toujours présente"}
+
+
+def fingerprint(f) -> str:
+    key = f"{f.vuln_id}\0{f.pkg}\0{f.version}".encode("utf-8", "replace")
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+def _package(f) -> str:
+    return f"{f.pkg}@{f.version}" if f.pkg and f.version else f.pkg
+
+
+def _clean(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def _fixed_order(entry):
+    sev = entry[0]
+    return (SEVERITIES.index(sev) if sev in SEVERITIES else len(SEVERITIES), entry[1], entry[2])
+
+
+class Delta:
+    """Résultat de la comparaison : compteurs + vulnérabilités corrigées."""
+
+    __slots__ = ("new", "seen", "fixed")
+
+    def __init__(self, new: int, seen: int, fixed: list):
+        self.new = new
+        self.seen = seen
+        # (sévérité, ID, package) des empreintes disparues
+        self.fixed = fixed
+
+
+class FingerprintStore:
+    """
+    Empreintes du build courant (``<out_dir>/<stem>.fingerprints``) et du
+    build précédent. Sans ``state_dir``, le précédent est le fichier laissé
+    dans ``out_dir`` ; avec, il est lu (et republié) dans ``state_dir``, ce
+    qui survit à un workspace vidé entre deux builds.
+    """
+
+    def __init__(self, out_dir: Path, stem: str, state_dir=None):
+        self.path = Path(out_dir) / f"{stem}.fingerprints"
+        self.previous_path = Path(state_dir) / self.path.name if state_dir else self.path
+
+    def previous_digest(self) -> str:
+        """Hash du fichier précédent (``""`` s'il n'existe pas), pour le cache de rendu."""
+        try:
+            return hashlib.sha256(self.previous_path.read_bytes()).hexdigest()
+        except OSError:
+            return ""
+
+    def _load_previous(self):
+        try:
+            fp = self.previous_path.open(encoding="utf-8")
+        except OSError:
+            return None
+        previous = {}
+        with fp:
+            for line in fp:
+                if line.startswith("#"):
+                    continue
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 4:
+                    previous[parts[0]] = (parts[1], parts[2], parts[3])
+        return previous
+
+    def diff(self, findings):
+        """
+        Renseigne ``status`` sur chaque finding et renvoie un ``Delta`` ;
+        ``None`` (statuts laissés vides) s'il n'y a pas de build précédent.
+        """
+        previous = self._load_previous()
+        if previous is None:
+            return None
+
+        current = set()
+        new = seen = 0
+        for f in findings:
+            key = fingerprint(f)
+            current.add(key)
+            if key in previous:
+                f.status = STATUS_SEEN
+                seen += 1
+            else:
+                f.status = STATUS_NEW
+                new += 1
+
+        fixed = sorted((previous[k] for k in previous.keys() - current), key=_fixed_order)
+        return Delta(new, seen, fixed)
+
+    def save(self, findings):
+        """Écrit les empreintes du build courant (triées : sortie déterministe)."""
+        lines = {}
+        for f in findings:
+            lines[fingerprint(f)] = f"{_clean(f.severity)}\t{_clean(f.vuln_id)}\t{_clean(_package(f))}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as fp:
+            fp.write(_HEADER)
+            for key in sorted(lines):
+                fp.write(f"{key}\t{lines[key]}\n")
+
+    def publish(self):
+        """Recopie le fichier courant dans ``state_dir`` pour le build suivant."""
+        if self.previous_path != self.path and self.path.exists():
+            self.previous_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.path, self.previous_path)
+
+
+def delta_badge(f) -> str:
+    """Badge "Nouvelle" / "Toujours présente" d'une ligne (``""`` sans comparaison)."""
+    return _BADGES.get(f.status, "")
+
+
+def delta_summary(delta) -> str:
+    """Pastilles d'évolution + liste repliée des corrigées, sous le résumé."""
+    if delta is None:
+        return ""
+    html = (
+        "\n        <div class='delta-row'>"
+        f"<span class='delta-pill delta-pill-new'>Nouvelles : <strong>+{delta.new}</strong></span>"
+        f"<span class='delta-pill delta-pill-fixed'>Corrigées : <strong>−{len(delta.fixed)}</strong></span>"
+        f"<span class='delta-pill'>Toujours présentes : <strong>{delta.seen}</strong></span>"
+        "</div>"
+    )
+    if delta.fixed:
+        items = "".join(
+            f"<li><span class='delta-sev'>{escape(sev or 'UNKNOWN')}</span>"
+            f"<span class='delta-id'>{escape(vuln_id)}</span>"
+            f"<span class='delta-pkg'>{escape(package)}</span></li>"
+            for sev, vuln_id, package in delta.fixed
+        )
+        html += (
+            "\n        <details class='delta-fixed'>"
+            f"<summary>{len(delta.fixed)} vulnérabilité(s) corrigée(s) depuis le build précédent</summary>"
+            f"<ul>{items}</ul></details>"
+        )
+    return html
@@ -0,0 +1,59 @@
+"""
+Arbre des chemins de dépendance (``from`` de Snyk).
+
+Dans un monorepo, des milliers de vulnérabilités partagent le même début de
+chemin (``app@1.0 → lib@2 → ...``). Plutôt que de répéter la chaîne complète
+sur chaque ligne, les chemins sont rangés dans un arbre de préfixes : chaque
+maillon n'est affiché qu'une fois, et les findings sont rattachés au nœud où
+leur chemin s'arrête (le package vulnérable, en pratique).
+"""
+
+
+class PathNode:
+    """Nœud de l'arbre : un maillon de chemin, ses enfants et les findings qui s'y arrêtent."""
+
+    __slots__ = ("name", "children", "findings", "total")
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.children = {}
+        self.findings = []
+        # Findings de tout le sous-arbre
+        self.total = 0
+
+
+def build_tree(findings) -> PathNode:
+    """Arbre de préfixes des ``path`` de ``findings`` (ordre de première apparition conservé)."""
+    root = PathNode()
+    for f in findings:
+        node = root
+        node.total += 1
+        for step in f.path:
+            child = node.children.get(step)
+            if child is None:
+                child = node.children[step] = PathNode(step)
+            child.total += 1
+            node = child
+        node.findings.append(f)
+    return root
+
+
+def walk(root: PathNode):
+    """
+    Parcours en profondeur, sans récursion : ``(profondeur, maillons, total,
+    findings)`` pour chaque nœud à afficher. Un maillon sans finding qui n'a
+    qu'un enfant est fusionné avec lui (``maillons`` en contient alors
+    plusieurs). Les findings sans chemin sont rendus en premier, avec
+    ``maillons`` vide.
+    """
+    if root.findings:
+        yield 0, (), len(root.findings), root.findings
+    stack = [(child, 0) for child in reversed(root.children.values())]
+    while stack:
+        node, depth = stack.pop()
+        names = [node.name]
+        while not node.findings and len(node.children) == 1:
+            node = next(iter(node.children.values()))
+            names.append(node.name)
+        yield depth, names, node.total, node.findings
+        stack.extend((child, depth + 1) for child in reversed(node.children.values()))
@@ -0,0 +1,128 @@
+"""
+Détails chargés à la demande (``--lazy-details``) : la page ne garde qu'une
+ligne de titre par vulnérabilité ; description complète, références et
+vecteur CVSS (et lien source) partent dans un JSON gzip à côté du rapport
+(``<stem>.details.json.gz``), indexé par ID de vulnérabilité.
+
+Le fichier n'est téléchargé et décompressé (``DecompressionStream``) qu'à la
+première ouverture d'un bloc "Détails". Comme le tableau virtualisé, cela
+suppose une CSP qui autorise le script inline de la page et ``fetch`` sur le
+même répertoire (HTML Publisher servi en HTTP, pas en ``file://``).
+"""
+import gzip
+import json
+from html import escape
+from pathlib import Path
+
+SHORT_TITLE = 160
+
+
+def details_name(stem: str) -> str:
+    return f"{stem}.details.json.gz"
+
+
+def short_title(text: str, limit: int = SHORT_TITLE) -> str:
+    """Première phrase (ou début) d'une description, pour la ligne de titre."""
+    text = " ".join(text.split())
+    end = text.find(". ")
+    if 0 < end < limit:
+        return text[: end + 1]
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def write_details(path: Path, findings) -> int:
+    """
+    Écrit le JSON gzip ``{id: {"d": description, "u": source, "r": [références], "v": vecteur}}``
+    au fil de l'eau (une entrée par ID). ``mtime`` à 0 : même contenu, mêmes
+    octets. Renvoie le nombre d'entrées.
+    """
+    seen = set()
+    with open(path, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as gz:
+        gz.write(b"{")
+        for f in findings:
+            if not f.vuln_id or f.vuln_id in seen:
+                continue
+            entry = {"d": f.description}
+            if f.url:
+                entry["u"] = f.url
+            if f.references:
+                entry["r"] = list(f.references)
+            if f.cvss_vector:
+                entry["v"] = f.cvss_vector
+            sep = b"," if seen else b""
+            seen.add(f.vuln_id)
+            gz.write(sep + json.dumps(f.vuln_id).encode() + b":" + json.dumps(entry, ensure_ascii=False).encode())
+        gz.write(b"}")
+    return len(seen)
+
+
+def details_toggle(vuln_id: str) -> str:
+    """Bloc repliable d'une ligne, complété par le script à la première ouverture."""
+    return f"<details class='v-more' data-id='{escape(vuln_id)}'><summary>Détails</summary></details>"
+
+
+def details_script(stem: str) -> str:
+    """Script inline à placer en fin de page (une fois)."""
+    return f"\n        <script data-src='{escape(details_name(stem))}'>{DETAILS_JS}</script>"
+
+
+DETAILS_JS = """
+(function () {
+  var src = document.currentScript.getAttribute("data-src"), pending = null;
+
+  function load() {
+    if (!pending) {
+      pending = fetch(src).then(function (r) {
+        if (!r.ok) throw new Error(r.status);
+        return r.arrayBuffer();
+      }).then(function (buf) {
+        var bytes = new Uint8Array(buf);
+        // Déjà décompressé si le serveur l'a envoyé avec Content-Encoding: gzip
+        if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) return new Response(buf).json();
+        var stream = new Blob([buf]).stream().pipeThrough(new DecompressionStream("gzip"));
+        return new Response(stream).json();
+      });
+      pending.catch(function () { pending = null; });
+    }
+    return pending;
+  }
+
+  function add(parent, tag, cls, text) {
+    var el = document.createElement(tag);
+    if (cls) el.className = cls;
+    if (text) el.textContent = text;
+    parent.appendChild(el);
+    return el;
+  }
+
+  function fill(body, x) {
+    body.textContent = "";
+    if (!x) { add(body, "p", "v-desc", "Pas de description détaillée fournie."); return; }
+    add(body, "p", "v-desc", x.d || "Pas de description détaillée fournie.");
+    if (x.v) add(body, "p", "v-vector", "Vecteur CVSS : " + x.v);
+    var refs = (x.u ? [x.u] : []).concat((x.r || []).filter(function (url) { return url !== x.u; }));
+    if (refs.length) {
+      var ul = add(body, "ul", "v-refs");
+      refs.forEach(function (url) {
+        var a = add(add(ul, "li"), "a", "", url);
+        if (/^https?:/i.test(url)) a.href = url;
+        a.target = "_blank";
+        a.rel = "noreferrer noopener";
+      });
+    }
+  }
+
+  document.addEventListener("toggle", function (e) {
+    var d = e.target;
+    if (!d.open || !d.classList || !d.classList.contains("v-more") || d.getAttribute("data-loaded")) return;
+    var body = d.querySelector(".v-more-body") || add(d, "div", "v-more-body");
+    body.textContent = "Chargement…";
+    load().then(function (all) {
+      d.setAttribute("data-loaded", "1");
+      fill(body, all[d.getAttribute("data-id")]);
+    }, function () {
+      body.textContent = "Détails indisponibles (" + src + ").";
+    });
+  }, true);
+})();
+"""
@@ -0,0 +1,141 @@
+"""
+Historique des findings dans une base SQLite locale.
+
+Chaque générateur y verse ses findings normalisés, rangés par numéro de build
+(``BUILD_NUMBER`` sous Jenkins) : les questions de tendance ("depuis quand
+CVE-X est-elle dans l'image ?", "combien de CRITICAL sur les 200 derniers
+builds ?") se résolvent ensuite par des requêtes indexées, sans garder ni
+relire les anciens JSON. Voir ``scripts/report_history.py`` pour les requêtes.
+
+Les clés ne contiennent pas la branche : une base par branche (numéros de
+build propres à chaque branche sous Jenkins multibranch).
+"""
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    build       INTEGER NOT NULL,
+    tool        TEXT    NOT NULL,
+    digest      TEXT    NOT NULL,
+    total       INTEGER NOT NULL,
+    ingested_at TEXT    NOT NULL,
+    PRIMARY KEY (build, tool)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    build    INTEGER NOT NULL,
+    tool     TEXT    NOT NULL,
+    vuln_id  TEXT    NOT NULL,
+    cve      TEXT    NOT NULL,
+    pkg      TEXT    NOT NULL,
+    version  TEXT    NOT NULL,
+    severity TEXT    NOT NULL,
+    cvss     REAL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_build ON findings (build, tool);
+CREATE INDEX IF NOT EXISTS idx_findings_cve ON findings (cve, build);
+CREATE INDEX IF NOT EXISTS idx_findings_vuln_id ON findings (vuln_id, build);
+CREATE INDEX IF NOT EXISTS idx_findings_pkg ON findings (pkg, build);
+CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings (severity, build);
+CREATE INDEX IF NOT EXISTS idx_builds_digest ON builds (tool, digest);
+"""
+
+
+def connect(db_path):
+    """Ouvre (et crée au besoin) la base ; les générateurs peuvent tourner en parallèle."""
+    import sqlite3  # chargé seulement si l'historique est activé
+
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _rows(build: int, tool: str, findings):
+    for f in findings:
+        yield (
+            build,
+            tool,
+            f.vuln_id,
+            f.cves[0] if f.cves else f.vuln_id,
+            f.pkg,
+            f.version,
+            f.severity,
+            f.cvss_score,
+        )
+
+
+class History:
+    """Versement des findings d'un outil pour un build donné."""
+
+    def __init__(self, db_path, build: int, tool: str):
+        self.db_path = db_path
+        self.build = build
+        self.tool = tool
+
+    @classmethod
+    def from_args(cls, args, tool: str):
+        """``None`` si la base ou le numéro de build n'est pas fourni."""
+        if not args.history_db or args.build is None:
+            return None
+        return cls(args.history_db, args.build, tool)
+
+    def _replace(self, conn, digest: str, total: int):
+        from datetime import datetime, timezone
+
+        conn.execute("DELETE FROM findings WHERE build = ? AND tool = ?", (self.build, self.tool))
+        conn.execute(
+            "INSERT OR REPLACE INTO builds (build, tool, digest, total, ingested_at) VALUES (?, ?, ?, ?, ?)",
+            (self.build, self.tool, digest, total, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+        )
+
+    def ingest(self, findings, digest: str):
+        """
+        Remplace les findings de (build, outil) par ``findings`` — relancer un
+        build ne crée pas de doublons. ``digest`` identifie le JSON d'entrée.
+        """
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                self._replace(conn, digest, len(findings))
+                conn.executemany(
+                    "INSERT INTO findings (build, tool, vuln_id, cve, pkg, version, severity, cvss) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    _rows(self.build, self.tool, findings),
+                )
+        finally:
+            conn.close()
+
+    def replay(self, digest: str) -> bool:
+        """
+        Rapport repris du cache (JSON identique à un build déjà versé) : recopie
+        les findings de ce build-là sous le build courant, sans parser le JSON.
+        ``False`` si aucun build versé n'a ce ``digest``.
+        """
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                done = conn.execute(
+                    "SELECT 1 FROM builds WHERE build = ? AND tool = ? AND digest = ?",
+                    (self.build, self.tool, digest),
+                ).fetchone()
+                if done:
+                    return True
+                row = conn.execute(
+                    "SELECT build, total FROM builds WHERE tool = ? AND digest = ? AND build != ? "
+                    "ORDER BY build DESC LIMIT 1",
+                    (self.tool, digest, self.build),
+                ).fetchone()
+                if row is None:
+                    return False
+                source, total = row
+                self._replace(conn, digest, total)
+                conn.execute(
+                    "INSERT INTO findings (build, tool, vuln_id, cve, pkg, version, severity, cvss) "
+                    "SELECT ?, tool, vuln_id, cve, pkg, version, severity, cvss "
+                    "FROM findings WHERE build = ? AND tool = ?",
+                    (self.build, source, self.tool),
+                )
+            return True
+        finally:
+            conn.close()
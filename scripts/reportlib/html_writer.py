@@ -0,0 +1,37 @@
+"""
+Écriture HTML par blocs vers un fichier ouvert (ou tout objet avec ``write``).
+"""
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkedWriter:
+    """
+    Regroupe les petits fragments (une ligne de tableau, un chip...) et les
+    envoie au sink par blocs d'environ ``chunk_size`` caractères : la page
+    n'est jamais assemblée en entier en mémoire.
+    """
+
+    def __init__(self, sink, chunk_size: int = CHUNK_SIZE):
+        self._sink = sink
+        self._chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self._sink.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
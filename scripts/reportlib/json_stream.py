@@ -0,0 +1,349 @@
+"""
+Lecture JSON incrémentale pour les gros rapports de scanners.
+
+Le fichier est lu par blocs : seuls les éléments situés sous un chemin donné
+(ex. ``Results[].Vulnerabilities[]``) sont matérialisés, un à la fois, via
+``json.JSONDecoder.raw_decode``. Tout le reste est sauté sans créer d'objets
+Python, ce qui borne la mémoire à la taille d'un seul enregistrement.
+"""
+import functools
+import json
+import re
+
+# Marqueur de chemin : "chaque élément du tableau courant"
+EACH = None
+
+CHUNK_SIZE = 64 * 1024
+
+_STRUCT = re.compile(r'["{}\[\]]')
+_STRING_STOP = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[,\]}\s]")
+_SCALARS = (str, int, float, bool, type(None))
+
+# Conteneur entier (jusqu'à SKIP_DEPTH niveaux d'imbrication) reconnu d'un
+# seul appel au moteur d'expressions régulières, sans objet Python. Motifs
+# "déroulés" (une seule façon de reconnaître chaque caractère) : un échec,
+# valeur coupée par la fin du tampon ou plus profonde, reste linéaire.
+# Au-delà de SKIP_MAX_CHUNKS blocs, la valeur est sautée sans expression
+# régulière (pas de nouvel essai à chaque bloc sur les très gros sous-arbres).
+SKIP_DEPTH = 6
+SKIP_MAX_CHUNKS = 4
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_OTHER = r'[^"\[\]{}]*'
+
+
+def _container_pattern(depth: int) -> str:
+    item = _STRING if depth == 1 else f"{_STRING}|{_container_pattern(depth - 1)}"
+    body = f"{_OTHER}(?:(?:{item}){_OTHER})*"
+    return f"\\{{{body}\\}}|\\[{body}\\]"
+
+
+@functools.lru_cache(maxsize=None)
+def _container():
+    """Motif compilé au premier saut (~7 Ko de regex : inutile si rien n'est sauté)."""
+    return re.compile(_container_pattern(SKIP_DEPTH))
+
+
+class JsonStream:
+    """
+    Curseur sur un flux texte JSON, rechargé par blocs au fil de la lecture.
+    """
+
+    def __init__(self, fp, chunk_size: int = CHUNK_SIZE):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = 0) -> bool:
+        """Ajoute un bloc au tampon en jetant la partie déjà consommée."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(size or self._chunk_size)
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _error(self, msg: str):
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Renvoie le prochain caractère significatif ('' en fin de flux)."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            end = len(buf)
+            while pos < end and buf[pos] in " \t\n\r":
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise self._error(f"'{ch}' attendu")
+        self._pos += 1
+
+    def read_value(self):
+        """Décode la valeur suivante (scalaire ou conteneur complet)."""
+        ch = self.peek()
+        if not ch:
+            raise self._error("Fin de flux inattendue")
+        if ch not in '"{[':
+            # Nombre ou littéral : on s'assure qu'il n'est pas coupé par le bloc
+            while _SCALAR_END.search(self._buf, self._pos) is None and self._fill():
+                pass
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Valeur coupée par la fin du tampon : on relit un bloc plus
+                # gros à chaque essai pour rester linéaire sur les gros objets.
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Saute la valeur suivante sans construire d'objet Python."""
+        ch = self.peek()
+        if ch == '"':
+            self._pos += 1
+            self._skip(depth=0, in_string=True)
+        elif ch in ("{", "["):
+            if not self._skip_container():
+                self._skip(depth=0, in_string=False)
+        else:
+            self.read_value()
+
+    def _skip_container(self) -> bool:
+        """
+        Saute le conteneur suivant d'un bloc (``_container()``), en relisant
+        des blocs de plus en plus gros s'il est coupé par la fin du tampon.
+        ``False`` s'il est trop profond ou trop gros (au-delà de
+        ``SKIP_MAX_CHUNKS`` blocs) : à sauter caractère structurel par caractère.
+        """
+        pattern = _container()
+        size = self._chunk_size
+        limit = SKIP_MAX_CHUNKS * self._chunk_size
+        while True:
+            m = pattern.match(self._buf, self._pos)
+            if m is not None:
+                self._pos = m.end()
+                return True
+            if len(self._buf) - self._pos >= limit or not self._fill(size):
+                return False
+            size *= 2
+
+    def _skip(self, depth: int, in_string: bool):
+        while True:
+            buf = self._buf
+            if in_string:
+                m = _STRING_STOP.search(buf, self._pos)
+                if m is None:
+                    self._pos = len(buf)
+                elif m.group() == "\\":
+                    if m.end() < len(buf):
+                        self._pos = m.end() + 1
+                        continue
+                    # Échappement coupé : on garde le backslash pour le bloc suivant
+                    self._pos = m.start()
+                else:
+                    self._pos = m.end()
+                    in_string = False
+                    if depth == 0:
+                        return
+                    continue
+            else:
+                m = _STRUCT.search(buf, self._pos)
+                if m is None:
+                    self._pos = len(buf)
+                else:
+                    self._pos = m.end()
+                    ch = m.group()
+                    if ch == '"':
+                        in_string = True
+                    elif ch in "{[":
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            return
+                    continue
+            if not self._fill():
+                raise self._error("Fin de flux inattendue")
+
+    def iter_object(self):
+        """
+        Itère les clés de l'objet suivant. Après chaque clé, l'appelant doit
+        consommer la valeur (read_value / skip_value / descente).
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Clé d'objet attendue")
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            ch = self.peek()
+            self._pos += 1
+            if ch == ",":
+                continue
+            if ch == "}":
+                return
+            self._pos -= 1
+            raise self._error("',' ou '}' attendu")
+
+    def iter_array(self):
+        """
+        Itère les positions des éléments du tableau suivant ; l'appelant
+        consomme chaque élément.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            ch = self.peek()
+            self._pos += 1
+            if ch == ",":
+                continue
+            if ch == "]":
+                return
+            self._pos -= 1
+            raise self._error("',' ou ']' attendu")
+
+
+def _walk(stream: JsonStream, prefix: tuple, depth: int, context: dict, keep):
+    if depth == len(prefix):
+        yield context, stream.read_value()
+        return
+
+    step = prefix[depth]
+    ch = stream.peek()
+    if step is EACH:
+        if ch != "[":
+            stream.skip_value()
+            return
+        for _ in stream.iter_array():
+            yield from _walk(stream, prefix, depth + 1, context, keep)
+        return
+
+    if ch != "{":
+        stream.skip_value()
+        return
+    if keep:
+        context = dict(context)
+    for key in stream.iter_object():
+        if key == step:
+            yield from _walk(stream, prefix, depth + 1, context, keep)
+        elif keep and key in keep and stream.peek() not in ("{", "["):
+            value = stream.read_value()
+            if isinstance(value, _SCALARS):
+                context[key] = value
+        else:
+            stream.skip_value()
+
+
+def iter_items(path, prefix, keep=None, chunk_size: int = CHUNK_SIZE):
+    """
+    Produit ``(contexte, élément)`` pour chaque valeur trouvée sous ``prefix``.
+
+    ``prefix`` est une suite de clés d'objet et de marqueurs ``EACH`` ; par
+    exemple ``("Results", EACH, "Vulnerabilities", EACH)`` pour Trivy.
+    ``keep`` liste les clés scalaires des objets parents à recopier dans le
+    contexte (ex. ``"Target"``) ; elles doivent précéder le tableau parcouru
+    dans le document. Lève ``json.JSONDecodeError`` si le JSON est invalide.
+    """
+    keep = frozenset(keep) if keep else None
+    with open(path, encoding="utf-8", errors="ignore") as fp:
+        stream = JsonStream(fp, chunk_size)
+        yield from _walk(stream, tuple(prefix), 0, {}, keep)
+
+
+def top_level(path) -> str:
+    """
+    Premier caractère significatif du fichier : ``"{"`` (objet), ``"["``
+    (tableau)... ``""`` si le fichier est vide. Ne lit que le début du fichier.
+    """
+    with open(path, encoding="utf-8", errors="ignore") as fp:
+        return JsonStream(fp, 4096).peek()
+
+
+# Début de document candidat : "{" / "[" en début de ligne (colonne 0)
+_DOC_START = re.compile(r"^[{\[]", re.M)
+_BLANK = re.compile(r"\s*")
+
+
+def iter_documents(text: str):
+    """
+    Produit ``(début, fin, document)`` pour chaque objet/tableau JSON de ``text``
+    (sorties concaténées, une par ligne ou non, entrecoupées de logs).
+
+    Une seule passe avant : chaque document est décodé une fois par
+    ``raw_decode``. Un document commence en début de ligne ou juste après le
+    précédent ; les objets indentés à l'intérieur d'un document ne sont donc
+    jamais pris pour des documents. En cas d'échec (document tronqué ou
+    corrompu), la recherche reprend après la zone en erreur, pas à l'intérieur.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    glued = True
+    while True:
+        # Document collé au précédent ("}{" ou "}\n  {") ou en tête de texte, sinon prochain début de ligne
+        start = _BLANK.match(text, pos).end()
+        if not glued or start >= len(text) or text[start] not in "{[":
+            m = _DOC_START.search(text, pos)
+            if m is None:
+                return
+            start = m.start()
+        try:
+            doc, end = decoder.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            pos = max(e.pos, start + 1)
+            glued = False
+            continue
+        yield start, end, doc
+        pos = end
+        glued = True
+
+
+def pick_document(text: str, strategy: str = "last", keys=None, arrays: bool = False):
+    """
+    Renvoie un seul document de ``text`` : le dernier (``"last"``) ou le plus
+    volumineux (``"largest"``). Avec ``keys``, seuls les objets qui ont au
+    moins une de ces clés (et les tableaux si ``arrays``) sont retenus.
+    ``None`` si aucun JSON valide (de la bonne forme) n'est trouvé.
+    """
+    if strategy not in ("last", "largest"):
+        raise ValueError(f"Stratégie inconnue: {strategy}")
+
+    best = None
+    best_size = -1
+    for start, end, doc in iter_documents(text):
+        if keys is not None and not (
+            (isinstance(doc, dict) and any(k in doc for k in keys)) or (arrays and isinstance(doc, list))
+        ):
+            continue
+        if strategy == "last" or end - start > best_size:
+            best = doc
+            best_size = end - start
+    return best
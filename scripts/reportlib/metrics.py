@@ -0,0 +1,179 @@
+"""
+Instrumentation optionnelle des générateurs, phase par phase.
+
+Avec ``--metrics`` (ou ``REPORT_METRICS=1``), chaque générateur écrit
+``reports/<outil>/generator-metrics.json`` : temps mur, temps CPU et mémoire
+des phases load, normalize, aggregate, render et write. Pour la mémoire, le
+pic du processus (``ru_maxrss``) ne redescend jamais : chaque phase note donc
+ce qu'elle a ajouté (RSS en fin de phase moins RSS en début, et hausse du pic
+pendant la phase, nulle si elle est restée sous un pic antérieur) ; le pic
+absolu n'est donné qu'une fois, dans ``total``.
+
+La lecture étant en streaming, la conversion en ``Finding`` (normalize) et
+l'écriture du HTML (write) se font au fil de l'eau, au milieu des phases
+load et render : elles sont chronométrées à part (``timed`` / ``sink``) et
+retranchées de la phase englobante. Sans ``--metrics``, ``NullMetrics`` rend
+tout cela gratuit.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PHASES = ("load", "normalize", "aggregate", "render", "write")
+
+
+def _rss_kb():
+    """RSS courant en Ko (Linux), ``None`` ailleurs."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _growth(total, start, end):
+    """``total`` + (``end`` - ``start``) ; ``None`` si la mesure n'est pas disponible."""
+    if start is None or end is None:
+        return total
+    return (total or 0) + end - start
+
+
+class _TimedSink:
+    """Sink qui chronomètre les ``write`` du fichier sous-jacent."""
+
+    def __init__(self, metrics, out, name: str):
+        self._metrics = metrics
+        self._out = out
+        self._name = name
+
+    def write(self, text):
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._out.write(text)
+        self._metrics.add(self._name, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+class Metrics:
+    """Mesures d'une exécution de générateur."""
+
+    def __init__(self, tool: str, log: bool = False):
+        self.tool = tool
+        self.log = log
+        self.phases = {}
+        self.info = {}
+        self._start = (time.perf_counter(), time.process_time())
+        # Temps des sous-phases (timed / sink), à retrancher des phases englobantes
+        self._nested = [0.0, 0.0]
+
+    @classmethod
+    def from_args(cls, args, tool: str):
+        if not args.metrics:
+            return NullMetrics()
+        return cls(tool, log=args.metrics_log)
+
+    def _entry(self, name: str) -> dict:
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = self.phases[name] = {
+                "wall_s": 0.0,
+                "cpu_s": 0.0,
+                "rss_kb": None,
+                "rss_delta_kb": None,
+                "peak_rss_delta_kb": None,
+            }
+        return entry
+
+    def add(self, name: str, wall: float, cpu: float):
+        entry = self._entry(name)
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        self._nested[0] += wall
+        self._nested[1] += cpu
+
+    @contextmanager
+    def phase(self, name: str):
+        nested = tuple(self._nested)
+        rss, peak = _rss_kb(), _peak_rss_kb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall - (self._nested[0] - nested[0])
+            cpu = time.process_time() - cpu - (self._nested[1] - nested[1])
+            entry = self._entry(name)
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+            entry["rss_kb"] = _rss_kb()
+            entry["rss_delta_kb"] = _growth(entry["rss_delta_kb"], rss, entry["rss_kb"])
+            entry["peak_rss_delta_kb"] = _growth(entry["peak_rss_delta_kb"], peak, _peak_rss_kb())
+
+    def timed(self, name: str, func):
+        """``func`` dont chaque appel est compté dans la phase ``name``."""
+
+        def wrapper(*args, **kwargs):
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+        return wrapper
+
+    def sink(self, out, name: str = "write"):
+        """Enveloppe un fichier ouvert : le temps passé dans ``write`` va à ``name``."""
+        return _TimedSink(self, out, name)
+
+    def summary(self) -> str:
+        parts = [f"{name} {self.phases[name]['wall_s']:.2f} s" for name in PHASES if name in self.phases]
+        parts += [f"{name} {p['wall_s']:.2f} s" for name, p in self.phases.items() if name not in PHASES]
+        peak = _peak_rss_kb()
+        total = time.perf_counter() - self._start[0]
+        line = f"📈 {self.tool} : {' · '.join(parts)} · total {total:.2f} s"
+        return line + (f" · RSS max {peak / 1024:.0f} Mo" if peak else "")
+
+    def write(self, out_dir: Path):
+        """Écrit ``generator-metrics.json`` dans ``out_dir`` (+ la ligne de résumé si demandé)."""
+        report = {
+            "tool": self.tool,
+            **self.info,
+            "total": {
+                "wall_s": time.perf_counter() - self._start[0],
+                "cpu_s": time.process_time() - self._start[1],
+                "peak_rss_kb": _peak_rss_kb(),
+            },
+            "phases": self.phases,
+        }
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / "generator-metrics.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+        if self.log:
+            print(self.summary())
+
+
+class NullMetrics:
+    """Même interface que ``Metrics``, sans aucune mesure."""
+
+    def __init__(self):
+        self.info = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        yield
+
+    def timed(self, name: str, func):
+        return func
+
+    def sink(self, out, name: str = "write"):
+        return out
+
+    def write(self, out_dir: Path):
+        pass
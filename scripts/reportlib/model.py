@@ -0,0 +1,146 @@
+"""
+Modèle commun d'une vulnérabilité, quel que soit le scanner d'origine.
+
+Chaque générateur convertit l'entrée brute du scanner en ``Finding`` dès la
+lecture : seuls les champs affichés sont conservés (``__slots__``, pas de
+dict par instance) et les valeurs très répétées (sévérité, package, version,
+cible...) sont internées pour être partagées entre les enregistrements.
+"""
+import sys
+
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+
+def intern_str(value) -> str:
+    """Chaîne internée (``""`` pour une valeur absente)."""
+    if value is None or value == "":
+        return ""
+    return sys.intern(str(value))
+
+
+def as_score(value):
+    """Score CVSS en float, ``None`` si absent ou illisible."""
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_score(score) -> str:
+    return f"{score:.1f}" if score is not None else ""
+
+
+def as_list(value) -> list:
+    """Accepte une liste, une valeur seule ou ``None`` (champs CWE, CVE...)."""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+class Finding:
+    """
+    Vulnérabilité normalisée. Les champs texte valent ``""`` quand le scanner
+    ne fournit rien ; les valeurs par défaut d'affichage ("N/A", "?") restent
+    du ressort des renderers.
+    """
+
+    __slots__ = (
+        "tool",
+        "severity",
+        "vuln_id",
+        "title",
+        "description",
+        "pkg",
+        "version",
+        "fixed",
+        "cvss_score",
+        "cvss_vector",
+        "cwes",
+        "cves",
+        "url",
+        "targets",
+        "path",
+        "references",
+        "status",
+    )
+
+    def __init__(
+        self,
+        tool: str,
+        severity: str,
+        vuln_id: str,
+        title: str = "",
+        description: str = "",
+        pkg: str = "",
+        version: str = "",
+        fixed: str = "",
+        cvss_score=None,
+        cvss_vector: str = "",
+        cwes: tuple = (),
+        cves: tuple = (),
+        url: str = "",
+        target: str = "",
+        path: tuple = (),
+        references: tuple = (),
+    ):
+        self.tool = intern_str(tool)
+        self.severity = intern_str((severity or "").upper())
+        self.vuln_id = vuln_id or ""
+        self.title = title or ""
+        self.description = description or ""
+        self.pkg = intern_str(pkg)
+        self.version = intern_str(version)
+        self.fixed = intern_str(fixed)
+        self.cvss_score = as_score(cvss_score)
+        self.cvss_vector = intern_str(cvss_vector)
+        self.cwes = tuple(intern_str(c) for c in cwes if c)
+        self.cves = tuple(intern_str(c) for c in cves if c)
+        self.url = url or ""
+        self.targets = (intern_str(target),) if target else ()
+        self.path = tuple(intern_str(p) for p in path)
+        # Liens de référence : seulement quand ils sont affichés (--lazy-details)
+        self.references = tuple(str(r) for r in references if r)
+        # Évolution par rapport au build précédent (voir reportlib.delta)
+        self.status = ""
+
+    @property
+    def target(self) -> str:
+        """Première cible (image, fichier...) où la vulnérabilité a été vue."""
+        return self.targets[0] if self.targets else ""
+
+    def __repr__(self):
+        return f"Finding({self.tool}, {self.severity}, {self.vuln_id}, {self.pkg}@{self.version})"
+
+
+def count_by_severity(findings) -> dict:
+    """Nombre de findings par sévérité connue (clés de ``SEVERITIES``)."""
+    counts = {s: 0 for s in SEVERITIES}
+    for f in findings:
+        if f.severity in counts:
+            counts[f.severity] += 1
+    return counts
+
+
+def dedupe_findings(findings) -> list:
+    """
+    Fusionne en une passe les doublons (même ID, package et version installée)
+    remontés par plusieurs cibles : une seule ligne est gardée, dans l'ordre
+    de première apparition, avec la liste de toutes ses cibles.
+    """
+    index = {}
+    for f in findings:
+        key = (f.vuln_id, f.pkg, f.version)
+        kept = index.get(key)
+        if kept is None:
+            index[key] = f
+            continue
+        for t in f.targets:
+            if t not in kept.targets:
+                kept.targets += (t,)
+        if not kept.fixed and f.fixed:
+            kept.fixed = f.fixed
+    return list(index.values())
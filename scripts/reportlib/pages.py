@@ -0,0 +1,123 @@
+"""
+Assemblage des pages de rapport : page unique, ou découpage en plusieurs
+fichiers (``<stem>-001.html``, ``<stem>-002.html``...) avec une page d'index
+légère qui garde le résumé et liste les pages.
+"""
+import itertools
+import math
+from collections import namedtuple
+from pathlib import Path
+
+from reportlib.compress import open_output
+from reportlib.html_writer import ChunkedWriter
+
+# Morceaux fixes d'une page de rapport, propres à chaque générateur :
+# start (jusqu'au résumé inclus), table_start/table_end (autour des lignes),
+# end (fermeture de la page) et empty_row (tableau vide).
+PageLayout = namedtuple("PageLayout", "start table_start table_end end empty_row")
+
+
+def write_page(out, layout: PageLayout, rows):
+    """Écrit une page complète dans ``out`` ; ``rows`` produit le HTML des lignes."""
+    w = ChunkedWriter(out)
+    w.write(layout.start)
+    w.write(layout.table_start)
+    empty = True
+    for row in rows:
+        w.write(row)
+        empty = False
+    if empty:
+        w.write(layout.empty_row)
+    w.write(layout.table_end)
+    w.write(layout.end)
+    w.flush()
+
+
+def shard_name(stem: str, number: int) -> str:
+    return f"{stem}-{number:03d}.html"
+
+
+def _pager(stem: str, number: int, n_pages: int) -> str:
+    links = [f"<a href='{stem}.html'>Index</a>"]
+    if number > 1:
+        links.append(f"<a href='{shard_name(stem, number - 1)}'>← Précédente</a>")
+    links.append(f"<span>Page {number} / {n_pages}</span>")
+    if number < n_pages:
+        links.append(f"<a href='{shard_name(stem, number + 1)}'>Suivante →</a>")
+    return f"\n        <nav class='pager'>{''.join(links)}</nav>"
+
+
+def _same(out):
+    return out
+
+
+def clear_shards(out_dir: Path, stem: str):
+    """Supprime les pages ``<stem>-NNN.html`` (et leurs ``.gz``) laissées par une exécution précédente."""
+    for old in Path(out_dir).glob(f"{stem}-[0-9][0-9][0-9].html*"):
+        old.unlink()
+
+
+def write_sharded(
+    out_dir: Path,
+    stem: str,
+    layout: PageLayout,
+    rows,
+    total: int,
+    rows_per_page: int,
+    compress: bool = False,
+    sink=None,
+) -> list:
+    """
+    Répartit ``rows`` (``total`` lignes) sur des pages de ``rows_per_page``
+    lignes, puis écrit ``<stem>.html`` comme index. Les pages d'une exécution
+    précédente qui n'existent plus sont supprimées. Renvoie les fichiers écrits
+    (sans les variantes ``.gz`` de ``compress``). ``sink`` : enveloppe appliquée
+    à chaque fichier ouvert (``Metrics.sink``, pour chronométrer l'écriture).
+    """
+    sink = sink or _same
+    if rows_per_page <= 0:
+        raise ValueError("rows_per_page doit être > 0")
+
+    out_dir = Path(out_dir)
+    n_pages = max(1, math.ceil(total / rows_per_page))
+    clear_shards(out_dir, stem)
+
+    rows = iter(rows)
+    written = []
+    ranges = []
+    first = 1
+    for number in range(1, n_pages + 1):
+        path = out_dir / shard_name(stem, number)
+        pager = _pager(stem, number, n_pages)
+        with open_output(path, compress) as fp:
+            w = ChunkedWriter(sink(fp))
+            w.write(layout.start)
+            w.write(pager)
+            w.write(layout.table_start)
+            count = 0
+            for row in itertools.islice(rows, rows_per_page):
+                w.write(row)
+                count += 1
+            if not count:
+                w.write(layout.empty_row)
+            w.write(layout.table_end)
+            w.write(pager)
+            w.write(layout.end)
+            w.flush()
+        written.append(path)
+        ranges.append((path.name, first, first + count - 1))
+        first += count
+
+    index_path = out_dir / f"{stem}.html"
+    with open_output(index_path, compress) as fp:
+        w = ChunkedWriter(sink(fp))
+        w.write(layout.start)
+        w.write("\n        <ul class='shard-list'>")
+        for number, (name, lo, hi) in enumerate(ranges, start=1):
+            label = f"lignes {lo} à {hi}" if hi >= lo else "aucune ligne"
+            w.write(f"<li><a href='{name}'>Page {number}</a><span>{label}</span></li>")
+        w.write("</ul>")
+        w.write(layout.end)
+        w.flush()
+    written.insert(0, index_path)
+    return written
@@ -0,0 +1,121 @@
+"""
+Déroulé commun des générateurs Trivy, Snyk et Dependency-Check.
+
+Feuille commune, cache de rendu, empreintes du build précédent, historique,
+métriques et écriture (compressée ou non) sont les mêmes d'un outil à
+l'autre : chaque générateur ne fournit que la lecture de son JSON et ses
+fonctions de rendu (``Renderers``), puis appelle ``run_report``.
+"""
+from collections import namedtuple
+from pathlib import Path
+
+from reportlib.aggregate import aggregate
+from reportlib.assets import publish_base_stylesheet, stylesheet
+from reportlib.cache import RenderCache, cache_options, file_digest
+from reportlib.compress import open_output, with_variants, write_text
+from reportlib.delta import FingerprintStore
+from reportlib.details import details_name, write_details
+from reportlib.history import History
+from reportlib.metrics import Metrics
+from reportlib.pages import clear_shards
+
+# Rendus d'un générateur, selon les options :
+#   page(vulns, out, delta, agg)      page unique écrite dans ``out``
+#   virtual(vulns, out, delta, agg)   tableau virtualisé (--virtual)
+#   shards(vulns, out_dir, rows_per_page, delta, agg, compress=..., sink=...)
+#                                     pages découpées (--rows-per-page), renvoie les fichiers écrits
+Renderers = namedtuple("Renderers", "page virtual shards")
+
+
+def run_report(
+    args,
+    tool: str,
+    title: str,
+    json_path: Path,
+    out: Path,
+    generator_file: str,
+    load,
+    convert,
+    renderers: Renderers,
+    details: bool = False,
+):
+    """
+    Génère ``out`` (``reports/<outil>/<nom>.html``) depuis ``json_path``.
+
+    ``tool`` : nom de l'outil (historique, métriques, feuille ``<tool>.css``) ;
+    ``title`` : début des messages ("Rapport HTML Snyk") ; ``generator_file`` :
+    ``__file__`` du générateur, pour la clé de cache. ``load(json_path,
+    convert)`` lit les findings (``None`` : rien à générer) ; ``convert`` est
+    chronométré comme phase normalize. ``details`` : écrire le fichier de
+    détails chargé à la demande (``--lazy-details``).
+    """
+    out_dir, stem = out.parent, out.stem
+    fingerprints = FingerprintStore(out_dir, stem, args.state_dir)
+    history = History.from_args(args, tool)
+    metrics = Metrics.from_args(args, tool)
+
+    # Feuille commune aux rapports (hors cache de rendu, partagée)
+    publish_base_stylesheet(out_dir.parent, args.compress)
+
+    # JSON, générateur et build précédent inchangés : rien à recalculer
+    options = cache_options(args, previous=fingerprints.previous_digest())
+    cache = RenderCache.for_input(args.cache_dir, json_path, generator_file, options)
+    if cache is not None:
+        clear_shards(out_dir, stem)
+        with metrics.phase("cache"):
+            hit = cache.restore(out_dir) and (history is None or history.replay(file_digest(json_path)))
+        if hit:
+            fingerprints.publish()
+            metrics.info["cache_hit"] = True
+            metrics.write(out_dir)
+            print(f"♻️ {title} repris du cache : {out}")
+            return
+
+    with metrics.phase("load"):
+        vulns = load(json_path, metrics.timed("normalize", convert))
+    if vulns is None:
+        return
+
+    with metrics.phase("aggregate"):
+        if history is not None and json_path.exists():
+            history.ingest(vulns, file_digest(json_path))
+        delta = fingerprints.diff(vulns)
+        agg = aggregate(vulns)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with metrics.phase("render"):
+        if args.virtual:
+            clear_shards(out_dir, stem)
+            with open_output(out, args.compress) as fp:
+                renderers.virtual(vulns, metrics.sink(fp), delta, agg)
+            written = [out]
+            print(f"✅ {title} généré : {out} (tableau virtualisé)")
+        elif args.rows_per_page > 0:
+            written = renderers.shards(
+                vulns, out_dir, args.rows_per_page, delta, agg, compress=args.compress, sink=metrics.sink
+            )
+            print(f"✅ {title} généré : {out} (index + {len(written) - 1} page(s))")
+        else:
+            clear_shards(out_dir, stem)
+            with open_output(out, args.compress) as fp:
+                renderers.page(vulns, metrics.sink(fp), delta, agg)
+            written = [out]
+            print(f"✅ {title} généré : {out}")
+        details_path = out_dir / details_name(stem)
+        if details:
+            write_details(details_path, vulns)
+            written.append(details_path)
+        else:
+            details_path.unlink(missing_ok=True)
+
+    with metrics.phase("write"):
+        # Surcharges propres au rapport, après la feuille commune (réécrites seulement si elles changent)
+        css_path = out_dir / f"{stem}.css"
+        write_text(css_path, stylesheet(tool), args.compress, css=True)
+        fingerprints.save(vulns)
+        fingerprints.publish()
+        if cache is not None:
+            cache.store(with_variants([css_path, fingerprints.path, *written]))
+
+    metrics.info["findings"] = len(vulns)
+    metrics.write(out_dir)
@@ -0,0 +1,40 @@
+"""
+Gabarits HTML précompilés pour les lignes de tableau.
+
+Un ``Fragment`` est compilé une seule fois (emplacements ``{}`` → format
+``%``) ; le remplir n'est plus qu'une mise en forme C de valeurs déjà
+échappées. ``Fragment.memo`` en fait une fonction mémorisée
+pour les champs peu variés (sévérité, package@version, fix, CWE, cibles...) :
+l'échappement et l'assemblage ne sont faits qu'une fois par valeur distincte,
+quel que soit le nombre de lignes.
+"""
+import functools
+from html import escape
+
+SLOT = "{}"
+
+
+class Fragment:
+    """Morceau de HTML avec des emplacements ``{}`` pour des valeurs échappées."""
+
+    __slots__ = ("_format",)
+
+    def __init__(self, template: str):
+        # Compilé en format ``%`` : le remplissage se fait entièrement en C
+        self._format = template.replace("%", "%%").replace(SLOT, "%s")
+
+    def __call__(self, *values: str) -> str:
+        """Remplit les emplacements avec ``values`` (déjà échappées) ; ``TypeError`` si le compte n'y est pas."""
+        return self._format % values
+
+    def memo(self, maxsize: int = 4096):
+        """
+        Fonction mémorisée qui échappe ses arguments bruts puis remplit le
+        fragment. À réserver aux champs à faible cardinalité.
+        """
+
+        @functools.lru_cache(maxsize=maxsize)
+        def render(*values: str) -> str:
+            return self(*(escape(v) for v in values))
+
+        return render
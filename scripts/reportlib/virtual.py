@@ -0,0 +1,126 @@
+"""
+Mode "tableau virtualisé" : au lieu d'une ligne DOM par vulnérabilité, la
+page embarque les findings sous forme d'un bloc JSON compact (table de
+chaînes dédupliquées + indices, colonne par colonne) et un petit script
+inline qui ne crée que les lignes visibles à l'écran.
+
+Le rapport reste un seul fichier HTML (+ la feuille CSS habituelle). Le
+script étant inline, l'affichage dans Jenkins suppose une CSP qui autorise
+les scripts de la page (HTML Publisher).
+"""
+import json
+
+from reportlib.delta import STATUS_LABELS
+from reportlib.html_writer import ChunkedWriter
+from reportlib.model import format_score
+
+# Colonnes affichées, dans l'ordre (la première doit rester la sévérité)
+COLUMNS = ("Gravité", "ID", "Titre", "Package", "Fix", "CVSS", "Cible / chemin", "Évolution")
+
+
+def _cells(f) -> tuple:
+    package = f"{f.pkg}@{f.version}" if f.pkg and f.version else f.pkg
+    location = ", ".join(f.targets) if f.targets else " → ".join(f.path)
+    title = f.title or f.description[:160] or f.vuln_id
+    return (
+        f.severity or "UNKNOWN",
+        f.vuln_id,
+        title,
+        package,
+        f.fixed,
+        format_score(f.cvss_score),
+        location,
+        STATUS_LABELS.get(f.status, ""),
+    )
+
+
+def _json(value) -> str:
+    # "<" échappé pour ne jamais fermer la balise <script> prématurément
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+
+def write_virtual_page(out, layout, findings):
+    """
+    Écrit ``layout.start`` + le tableau virtualisé + ``layout.end`` dans ``out``.
+    Les lignes sont sérialisées au fil de l'eau ; seule la table des chaînes
+    distinctes est gardée en mémoire jusqu'à la fin.
+    """
+    w = ChunkedWriter(out)
+    w.write(layout.start)
+    w.write(_VIEWPORT)
+    w.write(f'<script type="application/json" id="vt-data">{{"fields":{_json(COLUMNS)},"rows":[')
+
+    strings = {}
+    sep = ""
+    for f in findings:
+        indexes = []
+        for value in _cells(f):
+            i = strings.get(value)
+            if i is None:
+                i = strings[value] = len(strings)
+            indexes.append(str(i))
+        w.write(sep + ",".join(indexes))
+        sep = ","
+
+    w.write(f'],"strings":{_json(list(strings))}}}</script>')
+    w.write(f"\n        <script>{VIRTUAL_JS}</script>")
+    w.write(layout.end)
+    w.flush()
+
+
+_VIEWPORT = (
+    "\n        <div class='vt'>"
+    "<div class='vt-head'>"
+    + "".join(f"<span>{label}</span>" for label in COLUMNS)
+    + "</div>"
+    "<div class='vt-viewport' id='vt-viewport'><div class='vt-spacer' id='vt-spacer'></div></div>"
+    "<p class='vt-footer'><span id='vt-count'>0</span> vulnérabilité(s)</p>"
+    "<p class='no-data' id='vt-empty' hidden>Aucune vulnérabilité détectée.</p>"
+    "</div>\n        "
+)
+
+VIRTUAL_JS = """
+(function () {
+  var data = JSON.parse(document.getElementById("vt-data").textContent);
+  var S = data.strings, R = data.rows, W = data.fields.length, N = R.length / W;
+  var H = 34, OVERSCAN = 8;
+  var viewport = document.getElementById("vt-viewport");
+  var spacer = document.getElementById("vt-spacer");
+  var pool = [];
+  spacer.style.height = N * H + "px";
+  document.getElementById("vt-count").textContent = N;
+  document.getElementById("vt-empty").hidden = N > 0;
+
+  function render() {
+    var first = Math.max(0, Math.floor(viewport.scrollTop / H) - OVERSCAN);
+    var last = Math.min(N, Math.ceil((viewport.scrollTop + viewport.clientHeight) / H) + OVERSCAN);
+    while (pool.length < last - first) {
+      var el = document.createElement("div");
+      for (var c = 0; c < W; c++) el.appendChild(document.createElement("span"));
+      spacer.appendChild(el);
+      pool.push(el);
+    }
+    for (var k = 0; k < pool.length; k++) {
+      var row = pool[k], i = first + k;
+      if (i >= last) { row.style.display = "none"; continue; }
+      row.style.display = "";
+      row.style.top = i * H + "px";
+      row.className = "vt-row vt-sev-" + S[R[i * W]].toLowerCase();
+      for (var c = 0; c < W; c++) {
+        var text = S[R[i * W + c]];
+        row.children[c].textContent = text;
+        row.children[c].title = text;
+      }
+    }
+  }
+
+  var pending = false;
+  viewport.addEventListener("scroll", function () {
+    if (pending) return;
+    pending = true;
+    requestAnimationFrame(function () { pending = false; render(); });
+  });
+  window.addEventListener("resize", render);
+  render();
+})();
+"""
@@ -0,0 +1,5 @@
+"""Les tests importent ``reportlib`` et les générateurs comme les scripts (depuis ``scripts/``)."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,60 @@
+"""Agrégats en une passe (``reportlib.aggregate``) comparés à un comptage naïf."""
+import random
+from collections import Counter
+
+import pytest
+
+from reportlib.aggregate import aggregate, breakdown_html
+from reportlib.model import SEVERITIES, Finding, count_by_severity
+
+# Sévérités des scanners, y compris inconnues ou absentes
+_SEVERITIES = ("CRITICAL", "high", "MEDIUM", "LOW", "UNKNOWN", "info", "", None)
+
+
+def _findings(n, seed):
+    rnd = random.Random(seed)
+    return [
+        Finding(
+            "trivy",
+            rnd.choice(_SEVERITIES),
+            f"CVE-{i}",
+            pkg=rnd.choice(("openssl", "zlib", "log4j", "")),
+            fixed=rnd.choice(("", "1.2.3")),
+            cwes=rnd.sample(("CWE-79", "CWE-89", "CWE-20"), rnd.randint(0, 2)),
+            target=rnd.choice(("img", "app.jar", "")),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n, seed", [(0, 0), (1, 1), (50, 2), (500, 3)])
+def test_matches_naive_counts(n, seed):
+    findings = _findings(n, seed)
+    # Générateur : une seule passe, sans relire les findings
+    agg = aggregate(f for f in findings)
+
+    assert agg.total == len(findings)
+    assert agg.counts == {sev: sum(1 for f in findings if f.severity == sev) for sev in SEVERITIES}
+    assert agg.counts == count_by_severity(findings)
+    assert agg.packages == Counter(f.pkg for f in findings if f.pkg)
+    assert agg.cwes == Counter(cwe for f in findings for cwe in f.cwes)
+    assert agg.targets == Counter(t for f in findings for t in f.targets)
+    assert agg.fixable == sum(1 for f in findings if f.fixed)
+
+
+def test_unknown_or_missing_severity_counts_in_total_only():
+    findings = [Finding("trivy", sev, "CVE-1") for sev in ("UNKNOWN", "", None, "negligible", "high")]
+    agg = aggregate(findings)
+    assert agg.total == 5
+    assert agg.counts == {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 0, "LOW": 0}
+
+
+def test_top_breaks_ties_by_name():
+    findings = [Finding("trivy", "LOW", "CVE-1", pkg=p) for p in ("b", "a", "c", "b", "a")]
+    assert aggregate(findings).top("packages", 2) == [("a", 2), ("b", 2)]
+
+
+def test_empty_report_has_no_breakdown():
+    agg = aggregate([])
+    assert (agg.total, agg.fixable_pct) == (0, 0.0)
+    assert breakdown_html(agg) == ""
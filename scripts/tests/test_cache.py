@@ -0,0 +1,90 @@
+"""Cache de rendu (``reportlib.cache``) : hit, miss et éviction des entrées les plus anciennes."""
+import argparse
+import os
+
+import pytest
+
+from reportlib import cache as cache_module
+from reportlib.cache import RenderCache, cache_options
+
+GENERATOR = __file__
+
+
+@pytest.fixture
+def report(tmp_path):
+    json_path = tmp_path / "report.json"
+    json_path.write_text('{"Results": []}', encoding="utf-8")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    (out_dir / "report.html").write_text("<html>1</html>", encoding="utf-8")
+    (out_dir / "report.css").write_text("body{}", encoding="utf-8")
+    return json_path, out_dir
+
+
+def _store(root, json_path, out_dir, options):
+    cache = RenderCache.for_input(root, json_path, GENERATOR, options)
+    cache.store([out_dir / "report.html", out_dir / "report.css"])
+    return cache
+
+
+def test_disabled_without_root_or_input(report, tmp_path):
+    json_path, _ = report
+    assert RenderCache.for_input(None, json_path, GENERATOR, {}) is None
+    assert RenderCache.for_input(tmp_path / "c", tmp_path / "absent.json", GENERATOR, {}) is None
+
+
+def test_hit_restores_files(report, tmp_path):
+    json_path, out_dir = report
+    root = tmp_path / "cache"
+    _store(root, json_path, out_dir, {"rows_per_page": 0})
+
+    target = tmp_path / "restored"
+    restored = RenderCache.for_input(root, json_path, GENERATOR, {"rows_per_page": 0}).restore(target)
+    assert sorted(p.name for p in restored) == ["report.css", "report.html"]
+    assert (target / "report.html").read_text(encoding="utf-8") == "<html>1</html>"
+
+
+def test_miss_on_changed_input_or_options(report, tmp_path):
+    json_path, out_dir = report
+    root = tmp_path / "cache"
+    _store(root, json_path, out_dir, {"rows_per_page": 0, "previous": ""})
+
+    assert RenderCache.for_input(root, json_path, GENERATOR, {"rows_per_page": 10, "previous": ""}).restore(
+        tmp_path / "r1"
+    ) is None
+    # Empreintes du build précédent différentes : autres badges, autre entrée
+    assert RenderCache.for_input(root, json_path, GENERATOR, {"rows_per_page": 0, "previous": "abc"}).restore(
+        tmp_path / "r2"
+    ) is None
+    json_path.write_text('{"Results": [1]}', encoding="utf-8")
+    cache_module.file_digest.cache_clear()
+    assert RenderCache.for_input(root, json_path, GENERATOR, {"rows_per_page": 0, "previous": ""}).restore(
+        tmp_path / "r3"
+    ) is None
+
+
+def test_incomplete_entry_is_a_miss(report, tmp_path):
+    json_path, out_dir = report
+    cache = _store(tmp_path / "cache", json_path, out_dir, {})
+    (cache.entry / "report.css").unlink()
+    assert cache.restore(tmp_path / "restored") is None
+
+
+def test_oldest_entries_are_evicted(report, tmp_path, monkeypatch):
+    json_path, out_dir = report
+    monkeypatch.setattr(cache_module, "MAX_ENTRIES", 3)
+    root = tmp_path / "cache"
+    entries = []
+    for n in range(5):
+        entries.append(_store(root, json_path, out_dir, {"n": n}))
+        # Dates distinctes et croissantes, indépendantes de la résolution du système de fichiers
+        os.utime(entries[-1].entry, (1_000_000 + n, 1_000_000 + n))
+
+    kept = sorted(p.name for p in root.iterdir() if p.is_dir())
+    assert kept == sorted(c.key for c in entries[2:])
+    assert entries[0].restore(tmp_path / "r") is None
+
+
+def test_cache_options_ignore_working_dirs():
+    args = argparse.Namespace(rows_per_page=0, cache_dir="/a", state_dir="/b", history_db="/c", build=7, metrics=True)
+    assert cache_options(args, previous="x") == {"rows_per_page": 0, "previous": "x"}
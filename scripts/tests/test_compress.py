@@ -0,0 +1,61 @@
+"""Minification au fil de l'eau (``reportlib.compress``) : même résultat quel que soit le découpage."""
+import gzip
+
+import pytest
+
+from reportlib.compress import CompressedWriter, HtmlMinifier
+
+PAGE = """<!DOCTYPE html>
+<html>
+  <head>
+    <title>Rapport</title>
+  </head>
+  <body>
+    <table>
+      <tr>
+        <td>CVE-1</td>   <td>openssl 3.0.1</td>
+      </tr>
+      <tr>
+        <td>texte
+          sur deux lignes</td>
+      </tr>
+    </table>
+    <p>a > b</p>
+  \t
+  </body>
+</html>
+"""
+
+
+def _minify_whole(text):
+    minifier = HtmlMinifier()
+    return minifier.feed(text) + minifier.flush()
+
+
+def _minify_chunks(text, size):
+    minifier = HtmlMinifier()
+    out = [minifier.feed(text[i : i + size]) for i in range(0, len(text), size)]
+    return "".join(out) + minifier.flush()
+
+
+def test_indentation_between_tags_is_removed():
+    minified = _minify_whole(PAGE)
+    assert "<html><head><title>" in minified
+    # Blanc sans saut de ligne et texte des cellules conservés
+    assert "<td>CVE-1</td>   <td>" in minified
+    assert "texte\n          sur deux lignes" in minified
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_chunked_feed_matches_one_pass(size):
+    assert _minify_chunks(PAGE, size) == _minify_whole(PAGE)
+
+
+def test_writer_keeps_gzip_identical_to_page(tmp_path):
+    path = tmp_path / "rapport.html"
+    with CompressedWriter(path) as out:
+        for i in range(0, len(PAGE), 5):
+            out.write(PAGE[i : i + 5])
+    raw = path.read_text(encoding="utf-8")
+    assert raw == _minify_whole(PAGE)
+    assert gzip.decompress((tmp_path / "rapport.html.gz").read_bytes()).decode("utf-8") == raw
@@ -0,0 +1,49 @@
+"""Rapport consolidé : jointure des scanners par CVE et options acceptées."""
+import pytest
+
+from generate_consolidated_report import join_by_cve, main
+from reportlib.cli import build_parser, output_argv
+from reportlib.model import Finding
+
+
+def test_join_by_cve_merges_scanners():
+    trivy = [
+        Finding("trivy", "MEDIUM", "CVE-1", title="Trivy", pkg="openssl", version="3.0.1"),
+        Finding("trivy", "MEDIUM", "CVE-1", pkg="openssl", version="3.0.2"),
+        Finding("trivy", "LOW", "CVE-9"),
+    ]
+    # Advisory Snyk rattaché à sa CVE ; sans CVE, son propre identifiant sert de clé
+    snyk = [
+        Finding("snyk", "HIGH", "SNYK-JAVA-1", title="Snyk", pkg="openssl", version="3.0.1", cves=("CVE-1",)),
+        Finding("snyk", "CRITICAL", "SNYK-JS-2", pkg="lodash"),
+    ]
+    dc = [Finding("dependency-check", "", "CVE-9", pkg="app.jar")]
+
+    issues = join_by_cve(trivy, snyk, dc)
+    assert [i.key for i in issues] == ["SNYK-JS-2", "CVE-1", "CVE-9"]
+
+    cve1 = issues[1]
+    # Sévérité la plus haute, premier titre, packages sans doublon
+    assert (cve1.severity, cve1.title) == ("HIGH", "Trivy")
+    assert cve1.tools == {"trivy": 2, "snyk": 1}
+    assert list(cve1.packages) == ["openssl@3.0.1", "openssl@3.0.2"]
+
+    cve9 = issues[2]
+    assert (cve9.severity, cve9.tools, list(cve9.packages)) == ("LOW", {"trivy": 1, "dependency-check": 1}, ["app.jar"])
+
+
+def test_join_by_cve_sorts_unknown_severity_last():
+    issues = join_by_cve([Finding("trivy", "", "CVE-2"), Finding("trivy", "LOW", "CVE-3"), Finding("trivy", "", "")])
+    assert [(i.key, i.severity) for i in issues] == [("CVE-3", "LOW"), ("CVE-2", "")]
+
+
+@pytest.mark.parametrize("option", ["--rows-per-page=10", "--virtual", "--cache-dir=/tmp", "--lazy-details"])
+def test_main_rejects_generator_only_options(option):
+    with pytest.raises(SystemExit) as exc:
+        main([option])
+    assert exc.value.code == 2
+
+
+def test_output_argv_keeps_only_output_options():
+    args = build_parser("test").parse_args(["--rows-per-page", "10", "--compress", "--cache-dir", "/tmp", "--metrics"])
+    assert output_argv(args) == ["--compress", "--metrics"]
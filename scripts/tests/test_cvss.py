@@ -0,0 +1,83 @@
+"""Vecteurs CVSS (``reportlib.cvss``) : scores de base de référence et choix de la source Trivy."""
+import pytest
+
+from reportlib.cvss import base_score, parse_vector, pick_trivy_cvss, resolve_score
+
+# Scores publiés (calculateurs NVD / FIRST)
+V3_SCORES = (
+    ("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H", 9.8),
+    ("CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:U/C:H/I:N/A:N", 6.5),
+    ("CVSS:3.1/AV:N/AC:L/PR:L/UI:R/S:C/C:L/I:L/A:N", 5.4),
+    ("CVSS:3.0/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H", 10.0),
+    ("CVSS:3.1/AV:L/AC:L/PR:L/UI:N/S:U/C:H/I:H/A:H", 7.8),
+    ("CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:H/I:N/A:N", 5.9),
+    ("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:N/I:N/A:H", 7.5),
+    ("CVSS:3.1/AV:P/AC:H/PR:H/UI:R/S:U/C:L/I:N/A:N", 1.6),
+    ("CVSS:3.1/AV:N/AC:L/PR:H/UI:N/S:C/C:L/I:L/A:N", 5.5),
+    ("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:N/I:N/A:N", 0.0),
+)
+V2_SCORES = (
+    ("AV:N/AC:L/Au:N/C:P/I:P/A:P", 7.5),
+    ("AV:N/AC:M/Au:N/C:N/I:P/A:N", 4.3),
+    ("AV:N/AC:L/Au:N/C:C/I:C/A:C", 10.0),
+    ("AV:L/AC:L/Au:N/C:C/I:C/A:C", 7.2),
+    ("(AV:N/AC:L/Au:S/C:P/I:N/A:N)", 4.0),
+)
+V4 = "CVSS:4.0/AV:N/AC:L/AT:N/PR:N/UI:N/VC:H/VI:H/VA:H/SC:N/SI:N/SA:N"
+
+
+@pytest.mark.parametrize("vector, score", V3_SCORES + V2_SCORES)
+def test_base_score(vector, score):
+    assert base_score(vector) == score
+
+
+def test_v4_is_parsed_but_not_scored():
+    assert parse_vector(V4)[0] == "4.0"
+    assert base_score(V4) is None
+
+
+@pytest.mark.parametrize(
+    "vector",
+    (
+        "",
+        "garbage",
+        "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H",  # A manquant
+        "CVSS:3.1/AV:X/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",  # valeur inconnue
+        "CVSS:3.1/AV:N/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",  # métrique en double
+        "CVSS:9.0/AV:N",
+        "AV:N/AC:L/Au:N/C:P/I:P",
+    ),
+)
+def test_invalid_vectors(vector):
+    assert parse_vector(vector) is None
+    assert base_score(vector) is None
+
+
+def test_resolve_score_prefers_scanner_value():
+    assert resolve_score(8.1, V3_SCORES[0][0]) == 8.1
+    assert resolve_score("", V3_SCORES[0][0]) == 9.8
+    assert resolve_score(None, "garbage") is None
+
+
+def test_pick_trivy_cvss_vendor_priority():
+    cvss = {
+        "zz": {"V3Score": 1.0, "V3Vector": "z"},
+        "redhat": {"V3Score": 7.0, "V3Vector": "r"},
+        "nvd": {"V3Score": 9.8, "V3Vector": "n"},
+    }
+    assert pick_trivy_cvss(cvss) == (9.8, "n")
+    del cvss["nvd"]
+    assert pick_trivy_cvss(cvss) == (7.0, "r")
+    assert pick_trivy_cvss({"b": {"V3Score": 2.0}, "a": {"V3Score": 3.0}}) == (3.0, "")
+
+
+def test_pick_trivy_cvss_falls_through_unscored_versions():
+    v3 = V3_SCORES[1][0]
+    # v4 sans score : ni calculable ni fourni, on passe au v3 (score et vecteur du v3)
+    assert pick_trivy_cvss({"nvd": {"V40Vector": V4, "V3Vector": v3}}) == (6.5, v3)
+    assert pick_trivy_cvss({"nvd": {"V40Vector": V4, "V40Score": 9.3, "V3Score": 6.5}}) == (9.3, V4)
+    assert pick_trivy_cvss({"nvd": {"V40Vector": V4}, "ghsa": {"V2Score": 5.0}}) == (5.0, "")
+    # Aucun score : premier vecteur gardé
+    assert pick_trivy_cvss({"nvd": {"V40Vector": V4}}) == (None, V4)
+    assert pick_trivy_cvss({"nvd": {"Vector": V2_SCORES[0][0]}}) == (7.5, V2_SCORES[0][0])
+    assert pick_trivy_cvss(None) == (None, "")
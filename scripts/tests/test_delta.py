@@ -0,0 +1,63 @@
+"""Comparaison avec le build précédent (``reportlib.delta``) : nouvelles, corrigées, toujours présentes."""
+from reportlib.delta import STATUS_NEW, STATUS_SEEN, FingerprintStore, delta_badge, delta_summary
+from reportlib.model import Finding
+
+
+def _finding(vuln_id, pkg="openssl", version="3.0.1", severity="HIGH"):
+    return Finding("trivy", severity, vuln_id, pkg=pkg, version=version)
+
+
+def _build(store, findings):
+    """Un build : comparaison avec le précédent, puis enregistrement et publication."""
+    delta = store.diff(findings)
+    store.save(findings)
+    store.publish()
+    return delta
+
+
+def test_first_build_has_no_delta(tmp_path):
+    store = FingerprintStore(tmp_path / "out", "trivy-report")
+    findings = [_finding("CVE-1")]
+    assert store.previous_digest() == ""
+    assert _build(store, findings) is None
+    assert findings[0].status == ""
+    assert delta_badge(findings[0]) == ""
+    assert delta_summary(None) == ""
+
+
+def test_new_fixed_and_unchanged_across_two_builds(tmp_path):
+    store = FingerprintStore(tmp_path / "out", "trivy-report")
+    _build(store, [_finding("CVE-1"), _finding("CVE-2", severity="LOW"), _finding("CVE-3", severity="CRITICAL")])
+
+    current = [_finding("CVE-1"), _finding("CVE-4"), _finding("CVE-1", version="3.0.2")]
+    delta = _build(FingerprintStore(tmp_path / "out", "trivy-report"), current)
+    assert (delta.new, delta.seen) == (2, 1)
+    assert [f.status for f in current] == [STATUS_SEEN, STATUS_NEW, STATUS_NEW]
+    # Corrigées triées par sévérité, avec ID et package@version
+    assert delta.fixed == [("CRITICAL", "CVE-3", "openssl@3.0.1"), ("LOW", "CVE-2", "openssl@3.0.1")]
+    assert "Nouvelle" in delta_badge(current[1])
+    assert "−2" in delta_summary(delta) and "CVE-3" in delta_summary(delta)
+
+
+def test_identical_build_is_all_seen(tmp_path):
+    findings = [_finding("CVE-1"), _finding("CVE-2")]
+    _build(FingerprintStore(tmp_path, "r"), findings)
+    delta = _build(FingerprintStore(tmp_path, "r"), [_finding("CVE-2"), _finding("CVE-1")])
+    assert (delta.new, delta.seen, delta.fixed) == (0, 2, [])
+
+
+def test_state_dir_survives_an_emptied_workspace(tmp_path):
+    state = tmp_path / "state"
+    _build(FingerprintStore(tmp_path / "ws1", "r", state), [_finding("CVE-1")])
+    store = FingerprintStore(tmp_path / "ws2", "r", state)
+    assert store.previous_digest() != ""
+    delta = _build(store, [_finding("CVE-2")])
+    assert (delta.new, delta.seen, [fixed[1] for fixed in delta.fixed]) == (1, 0, ["CVE-1"])
+
+
+def test_missing_previous_file_in_state_dir(tmp_path):
+    (tmp_path / "out").mkdir()
+    # Fichier laissé dans le workspace, mais le précédent est lu dans state_dir (vide)
+    FingerprintStore(tmp_path / "out", "r").save([_finding("CVE-1")])
+    store = FingerprintStore(tmp_path / "out", "r", tmp_path / "state")
+    assert store.diff([_finding("CVE-1")]) is None
@@ -0,0 +1,48 @@
+"""Arbre des chemins de dépendance (``reportlib.deptree``) et son rendu dans le rapport Snyk."""
+from generate_snyk_report import render_tree_rows
+from reportlib.deptree import build_tree, walk
+from reportlib.model import Finding
+
+
+def _finding(vuln_id, *path, target=""):
+    return Finding("snyk", "HIGH", vuln_id, pkg=path[-1] if path else "", version="1", path=path, target=target)
+
+
+FINDINGS = [
+    _finding("A", "app@1", "lib@2", "x@1"),
+    _finding("B", "app@1", "lib@2", "y@1"),
+    _finding("C", "app@1", "lib@2", "y@1"),
+    _finding("D", "app@1", "other@3", "deep@1", "z@1"),
+    _finding("E"),
+]
+
+
+def test_shared_prefixes_are_grouped():
+    nodes = [(depth, list(names), total, [f.vuln_id for f in findings]) for depth, names, total, findings in walk(build_tree(FINDINGS))]
+    assert nodes == [
+        # Findings sans chemin d'abord
+        (0, [], 1, ["E"]),
+        (0, ["app@1"], 4, []),
+        # Maillons sans finding à enfant unique fusionnés
+        (1, ["lib@2"], 3, []),
+        (2, ["x@1"], 1, ["A"]),
+        (2, ["y@1"], 2, ["B", "C"]),
+        (1, ["other@3", "deep@1", "z@1"], 1, ["D"]),
+    ]
+
+
+def test_every_finding_appears_exactly_once():
+    seen = [f for _, _, _, findings in walk(build_tree(FINDINGS)) for f in findings]
+    assert sorted(id(f) for f in seen) == sorted(id(f) for f in FINDINGS)
+
+
+def test_tree_rows_keep_the_path_on_each_finding():
+    rows, total = render_tree_rows(FINDINGS, projects=("empty",))
+    rows = list(rows)
+    # 5 findings + 5 maillons + 1 section projet vide
+    assert total == len(rows) == 11
+    assert rows[0].startswith("<tr class='project-row'>")
+    finding_rows = [r for r in rows if "class='v-id'" in r]
+    assert len(finding_rows) == len(FINDINGS)
+    assert sum("Chemin" in r for r in finding_rows) == 4
+    assert "app@1 → other@3 → deep@1 → z@1" in finding_rows[-1]
@@ -0,0 +1,160 @@
+"""Lecture JSON incrémentale (``reportlib.json_stream``) : même résultat que ``json.load``."""
+import json
+import random
+
+import pytest
+
+from reportlib.json_stream import (
+    EACH,
+    SKIP_DEPTH,
+    SKIP_MAX_CHUNKS,
+    iter_documents,
+    iter_items,
+    pick_document,
+    top_level,
+)
+
+CHUNK_SIZES = (1, 2, 3, 7, 64, 65536)
+
+
+def _write(tmp_path, doc, indent=None):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(doc, indent=indent, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _expected(doc):
+    """``Results[].Vulnerabilities[]`` avec la cible, calculé sur le document chargé."""
+    return [
+        ({"Target": r["Target"]} if "Target" in r else {}, v)
+        for r in doc.get("Results") or []
+        if isinstance(r, dict)
+        for v in (r.get("Vulnerabilities") or [] if isinstance(r.get("Vulnerabilities"), list) else [])
+    ]
+
+
+TRIVY_LIKE = {
+    "SchemaVersion": 2,
+    "Metadata": {"OS": {"Family": "debian"}, "Layers": [[1, 2], {"a": "}]"}]},
+    "Results": [
+        {
+            "Target": "img (debian 12)",
+            "Packages": [{"Name": "x", "Tags": ["[", "{", "\\", '"']}],
+            "Vulnerabilities": [
+                {"VulnerabilityID": "CVE-1", "Title": 'bra}ck]ets "quoted" \\ é', "CVSS": {"nvd": {"V3Score": 9.8}}},
+                {"VulnerabilityID": "CVE-2", "Score": -1.5e3, "Fixed": None, "Ok": True},
+            ],
+        },
+        {"Target": "app.jar", "Vulnerabilities": []},
+        {"Target": "empty"},
+    ],
+}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("indent", (None, 2))
+def test_iter_items_matches_json_load(tmp_path, chunk_size, indent):
+    path = _write(tmp_path, TRIVY_LIKE, indent)
+    items = list(iter_items(path, ("Results", EACH, "Vulnerabilities", EACH), keep=("Target",), chunk_size=chunk_size))
+    assert items == _expected(TRIVY_LIKE)
+
+
+def test_keep_is_scoped_to_each_parent(tmp_path):
+    doc = {"Results": [{"Target": "a", "Vulnerabilities": [1]}, {"Vulnerabilities": [2]}]}
+    items = list(iter_items(_write(tmp_path, doc), ("Results", EACH, "Vulnerabilities", EACH), keep=("Target",)))
+    assert items == [({"Target": "a"}, 1), ({}, 2)]
+
+
+def test_missing_path_yields_nothing(tmp_path):
+    path = _write(tmp_path, {"Results": {"not": "a list"}, "other": [1, 2]})
+    assert list(iter_items(path, ("Results", EACH, "Vulnerabilities", EACH))) == []
+
+
+def test_top_level_array(tmp_path):
+    path = _write(tmp_path, [{"vulnerabilities": [1]}, {"vulnerabilities": []}])
+    assert top_level(path) == "["
+    assert [p for _, p in iter_items(path, (EACH,))] == [{"vulnerabilities": [1]}, {"vulnerabilities": []}]
+
+
+@pytest.mark.parametrize(
+    "text", ('{"Results": [{"Vulnerabilities": [1, 2', '{"Results": [{"Vulnerabilities": [1 2]}]}')
+)
+def test_invalid_json_raises(tmp_path, text):
+    path = tmp_path / "broken.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_items(path, ("Results", EACH, "Vulnerabilities", EACH), chunk_size=4))
+
+
+def _random_string(rng):
+    return "".join(rng.choice('ab{}[]"\\\n é ,:') for _ in range(rng.randint(0, 12)))
+
+
+def _random_value(rng, depth=0):
+    r = rng.random()
+    if depth > 8 or r < 0.4:
+        return rng.choice([_random_string(rng), 1, -2.5e3, True, None, 0])
+    if r < 0.7:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {_random_string(rng): _random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_fuzz_skipped_subtrees(tmp_path, seed):
+    """Sous-arbres sautés arbitraires (chaînes avec crochets, échappements, imbrication profonde)."""
+    rng = random.Random(seed)
+    doc = {
+        "junk": _random_value(rng),
+        "Results": [
+            {
+                "Packages": _random_value(rng),
+                "Target": _random_string(rng),
+                "Vulnerabilities": [_random_value(rng, 2) for _ in range(3)],
+                "More": _random_value(rng),
+            }
+            for _ in range(rng.randint(0, 4))
+        ],
+    }
+    path = _write(tmp_path, doc, rng.choice((None, 1)))
+    for chunk_size in CHUNK_SIZES:
+        items = list(
+            iter_items(path, ("Results", EACH, "Vulnerabilities", EACH), keep=("Target",), chunk_size=chunk_size)
+        )
+        assert items == _expected(doc)
+
+
+@pytest.mark.parametrize("chunk_size", (16, 4096))
+def test_skip_falls_back_when_too_deep_or_too_big(tmp_path, chunk_size):
+    """Sous-arbres hors de portée de la regex : plus profonds que SKIP_DEPTH ou plus gros que SKIP_MAX_CHUNKS blocs."""
+    deep = "x"
+    for _ in range(SKIP_DEPTH + 3):
+        deep = {"k": [deep, "]}"]}
+    big = [{"id": i, "text": "a]b}c" * 10} for i in range(SKIP_MAX_CHUNKS * chunk_size // 20)]
+    doc = {"Deep": deep, "Results": [{"Big": big, "Target": "t", "Deeper": deep, "Vulnerabilities": [1, {"a": 2}]}]}
+    path = _write(tmp_path, doc)
+    items = list(iter_items(path, ("Results", EACH, "Vulnerabilities", EACH), keep=("Target",), chunk_size=chunk_size))
+    assert items == _expected(doc)
+
+
+def _documents(text):
+    return [doc for _, _, doc in iter_documents(text)]
+
+
+def test_iter_documents_concatenated_and_noise():
+    text = 'log line\n{"a": 1}{"b": [1]}\n  [2]\n[INFO] x\n{"c": {"d": 1}}\n'
+    assert _documents(text) == [{"a": 1}, {"b": [1]}, [2], {"c": {"d": 1}}]
+
+
+def test_truncated_document_does_not_yield_nested_objects():
+    doc = json.dumps(TRIVY_LIKE, indent=2)
+    truncated = doc[: len(doc) * 2 // 3]
+    assert _documents(truncated) == []
+    assert pick_document(truncated, "last") is None
+
+
+def test_pick_document_checks_shape():
+    text = '{"SchemaVersion": 2, "Results": []}\n{"VulnerabilityID": "CVE-1"}\n[1]\n'
+    assert pick_document(text, "last") == [1]
+    assert pick_document(text, "last", keys=("SchemaVersion", "Results")) == {"SchemaVersion": 2, "Results": []}
+    assert pick_document(text, "last", keys=("vulnerabilities",), arrays=True) == [1]
+    assert pick_document(text, "largest", keys=("VulnerabilityID",)) == {"VulnerabilityID": "CVE-1"}
@@ -0,0 +1,39 @@
+"""Modèle commun (``reportlib.model``) : fusion des doublons vus par plusieurs cibles."""
+from reportlib.model import Finding, count_by_severity, dedupe_findings
+
+
+def _finding(vuln_id="CVE-1", pkg="openssl", version="3.0.1", target="", **kwargs):
+    return Finding("trivy", kwargs.pop("severity", "HIGH"), vuln_id, pkg=pkg, version=version, target=target, **kwargs)
+
+
+def test_same_finding_in_two_targets_is_merged():
+    findings = [_finding(target="img (debian 12)"), _finding(target="app.jar", fixed="3.0.2")]
+    merged = dedupe_findings(findings)
+    assert len(merged) == 1
+    assert merged[0].targets == ("img (debian 12)", "app.jar")
+    # Version corrigée reprise d'un doublon si la première ligne n'en a pas
+    assert merged[0].fixed == "3.0.2"
+    assert count_by_severity(merged)["HIGH"] == 1
+
+
+def test_other_version_or_package_stays_separate():
+    findings = [
+        _finding(target="a"),
+        _finding(version="3.0.2", target="b"),
+        _finding(pkg="libssl3", target="c"),
+        _finding(vuln_id="CVE-2", target="d"),
+    ]
+    merged = dedupe_findings(findings)
+    assert [(f.vuln_id, f.pkg, f.version, f.targets) for f in merged] == [
+        ("CVE-1", "openssl", "3.0.1", ("a",)),
+        ("CVE-1", "openssl", "3.0.2", ("b",)),
+        ("CVE-1", "libssl3", "3.0.1", ("c",)),
+        ("CVE-2", "openssl", "3.0.1", ("d",)),
+    ]
+
+
+def test_first_appearance_order_and_no_duplicate_target():
+    findings = [_finding("CVE-2", target="a"), _finding("CVE-1", target="a"), _finding("CVE-2", target="a")]
+    merged = dedupe_findings(findings)
+    assert [f.vuln_id for f in merged] == ["CVE-2", "CVE-1"]
+    assert merged[0].targets == ("a",)
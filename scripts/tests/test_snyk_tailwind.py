@@ -0,0 +1,41 @@
+"""Variante Tailwind du rapport Snyk : la feuille précompilée couvre toutes les classes des gabarits."""
+import re
+
+import pytest
+
+from generate_snyk_report import render_html
+from reportlib.assets import stylesheet
+from reportlib.model import Finding
+
+_CLASS_ATTR = re.compile(r"""class=(?:"([^"]*)"|'([^']*)')""")
+
+
+def _classes(html):
+    return {name for m in _CLASS_ATTR.finditer(html) for name in (m.group(1) or m.group(2) or "").split()}
+
+
+def _selector(name):
+    """Classe → sélecteur CSS échappé (``sm:p-6`` → ``.sm\\:p-6``)."""
+    return "." + re.sub(r"([^A-Za-z0-9_-])", r"\\\1", name)
+
+
+def _vulns():
+    return [
+        Finding("snyk", severity, f"SNYK-{i}", title="t", pkg="lodash", version="4.17.20", path=("app", "lodash"), url="https://snyk.io")
+        for i, severity in enumerate(("critical", "high", "medium", "low", ""))
+    ]
+
+
+@pytest.mark.parametrize("vulns", [[], _vulns()], ids=["empty", "all-severities"])
+def test_every_class_has_a_rule(vulns):
+    html = render_html(vulns)
+    css = stylesheet("snyk-tailwind")
+    missing = sorted(name for name in _classes(html) if not re.search(re.escape(_selector(name)) + r"[{:\s]", css))
+    assert missing == [], f"classes absentes de assets/snyk-tailwind.css : {' '.join(missing)}"
+
+
+def test_stylesheet_is_inline_without_network():
+    html = render_html(_vulns())
+    assert "<!-- tailwind.css -->" not in html
+    assert "<style>" in html and ".bg-slate-950{" in html
+    assert "cdn.tailwindcss.com" not in html and "<script" not in html